@@ -0,0 +1,533 @@
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import deque
+from itertools import accumulate
+
+from KodiLogEngine import KeywordMatcher, LineQueue, QUEUE_POLICIES, LineStore, LineIndex, LogFilter, LogTailer, LogStats, SessionIndex, LEVEL_TAGS, format_time, parse_lines, IndexCache, PerfCounters, EXPORT_FORMATS, export_lines, iter_file_lines
+from KodiLogGen import KodiLogGenerator, parse_size
+from KodiLogScan import scan_logs
+
+# Every benchmark prints a table and returns its metrics, which --json saves (with the machine
+# and settings) so two runs, e.g. before and after a change, can be compared with --compare.
+# Metric names carry their unit: *_per_s and *_mb_s are better when higher, *_ms, *_s and *_mb
+# when lower; other values (line counts...) describe the workload and should not change.
+
+# --- SAMPLE DATA ---
+LEVELS = ["debug", "info", "info", "info", "warning", "error"]
+MESSAGES = [
+    "CPythonInvoker(42, /storage/.kodi/addons/{a}/default.py): script successfully run",
+    "CAddonMgr::FindAddon: {a} v1.0.3 installed",
+    "CurlFile::Open failed with code 404 for https://example.com/{a}/list.json",
+    "EXCEPTION Thrown (PythonToCppException) : -->Python callback/script returned the following error<--",
+    "CVideoDatabase::GetMovieId ({a}) - no match",
+    "Skin Helper: unmatched parentheses in expression for {a}",
+    "ActiveAE::ProcessResampling - stream {a} resampled",
+]
+ADDONS = ["plugin.video.youtube", "script.module.requests", "plugin.video.alluneed", "skin.estuary", "pvr.iptvsimple", "plugin.video.balkan.green"]
+
+def sample_lines(count, seed=1):
+    rnd = random.Random(seed)
+    return [f"2024-05-01 12:00:{i % 60:02d}.{i % 1000:03d} T:{rnd.randint(1000, 9999)} {rnd.choice(LEVELS):>7} <general>: "
+            + rnd.choice(MESSAGES).format(a=rnd.choice(ADDONS)) + "\n" for i in range(count)]
+
+def rate(count, elapsed): return count / elapsed if elapsed > 0 else float("inf")
+
+# --- KEYWORD MATCHING ---
+def legacy_keyword_pass(lines, path):
+    # Mirrors the pre-engine path: the list file is read for the filter check and again
+    # (with a freshly joined regex) for every highlighted line.
+    def read_list():
+        with open(path, "r", encoding="utf-8", errors="ignore") as f: return [line.strip() for line in f if line.strip()]
+    hits = 0
+    for line in lines:
+        low = line.lower(); kw = read_list()
+        if kw and not any(k.lower() in low for k in kw): continue
+        kw = read_list()
+        hits += len(list(re.finditer("|".join(re.escape(k) for k in kw), line, re.IGNORECASE))) > 0
+    return hits
+
+def matcher_pass(lines, path):
+    m = KeywordMatcher(path); hits = 0
+    for line in lines: hits += bool(m.spans(line))
+    return hits
+
+def bench_keywords(args):
+    lines = sample_lines(args.lines)
+    print(f"Keyword matching: {len(lines)} lines against '{os.path.basename(args.list)}'")
+    results = {}
+    for name, fn in (("legacy", legacy_keyword_pass), ("matcher", matcher_pass)):
+        t = time.perf_counter(); hits = fn(lines, args.list); elapsed = time.perf_counter() - t
+        results[name] = rate(len(lines), elapsed)
+        print(f"  {name:<8} {results[name]:>12,.0f} lines/s  ({hits} matching lines)")
+    print(f"  speedup  {results['matcher'] / results['legacy']:>12.1f}x")
+    return {"legacy_lines_per_s": results["legacy"], "matcher_lines_per_s": results["matcher"], "lines": len(lines)}
+
+# --- GUI QUEUE STRESS ---
+class SimulatedText:
+    # Stand-in for the Tk Text widget so the stress test runs without a display: every call
+    # costs one Tcl round-trip plus a small cost per inserted segment.
+    def __init__(self, call_cost=0.0003, seg_cost=0.000004): self.call_cost = call_cost; self.seg_cost = seg_cost; self.lines = 0
+    def _busy(self, seconds):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end: pass
+    def insert(self, index, *args): self.lines += len(args) // 2; self._busy(self.call_cost + self.seg_cost * len(args) / 2)
+    def see(self, index): self._busy(self.call_cost)
+
+def produce(put, lines, rate_per_sec, duration):
+    start = time.perf_counter(); sent = 0
+    while True:
+        elapsed = time.perf_counter() - start
+        if elapsed >= duration: return sent
+        due = int(elapsed * rate_per_sec)
+        while sent < due: put(lines[sent % len(lines)]); sent += 1
+        time.sleep(0.001)
+
+def run_ui_loop(tick, producer, refresh_ms):
+    # Runs UI ticks every refresh_ms until the producer is done and tick() reports idle;
+    # returns the worst gap between two ticks, i.e. how long the UI was unresponsive.
+    worst = 0.0; last = time.perf_counter()
+    while True:
+        busy = tick(); now = time.perf_counter()
+        worst = max(worst, now - last); last = now
+        if not producer.is_alive() and not busy: return worst
+        time.sleep(max(0.0, refresh_ms / 1000 - (time.perf_counter() - now)))
+
+def stress_queue(lines, rate, duration, policy, refresh_ms=50, batch=2000, maxsize=5000):
+    q = LineQueue(maxsize, policy); text = SimulatedText(); sent = [0]; peak = [0]
+    def put(line):
+        while not q.put((line, "info", []), timeout=0.2): pass
+    producer = threading.Thread(target=lambda: sent.__setitem__(0, produce(put, lines, rate, duration)), daemon=True)
+    skipped = [0]
+    def tick():
+        peak[0] = max(peak[0], len(q))
+        items, dropped = q.drain(batch); skipped[0] += dropped
+        if items:
+            args = []
+            for line, tag, spans in items: args += [line, tag]
+            text.insert("end", *args); text.see("end")
+        return bool(items)
+    t = time.perf_counter(); producer.start(); worst = run_ui_loop(tick, producer, refresh_ms)
+    return {"sent": sent[0], "shown": text.lines, "skipped": skipped[0], "peak_pending": peak[0], "worst_gap_ms": worst * 1000, "elapsed": time.perf_counter() - t}
+
+def stress_legacy(lines, rate, duration, refresh_ms=50):
+    # One scheduled callback per line (insert + see + stats), as root.after(0, ...) did
+    events = deque(); text = SimulatedText(); sent = [0]; peak = [0]
+    producer = threading.Thread(target=lambda: sent.__setitem__(0, produce(events.append, lines, rate, duration)), daemon=True)
+    def tick():
+        # Tk runs every pending after(0) callback before it gets back to redraws and input
+        peak[0] = max(peak[0], len(events)); n = 0
+        while events:
+            peak[0] = max(peak[0], len(events)); line = events.popleft(); text.insert("end", line, "info"); text.see("end"); text._busy(text.call_cost); n += 1
+        return n > 0
+    t = time.perf_counter(); producer.start(); worst = run_ui_loop(tick, producer, refresh_ms)
+    return {"sent": sent[0], "shown": text.lines, "skipped": 0, "peak_pending": peak[0], "worst_gap_ms": worst * 1000, "elapsed": time.perf_counter() - t}
+
+def bench_stress(args):
+    lines = sample_lines(2000)
+    print(f"GUI queue stress: {args.rate:,} lines/s for {args.duration:.0f}s (simulated Text widget)")
+    print(f"  {'mode':<12} {'sent':>8} {'shown':>8} {'skipped':>8} {'peak queue':>11} {'worst UI gap':>13} {'elapsed':>8}")
+    runs = [("legacy", lambda: stress_legacy(lines, args.rate, args.duration))]
+    runs += [(policy, lambda policy=policy: stress_queue(lines, args.rate, args.duration, policy)) for policy in QUEUE_POLICIES]
+    results = {}
+    for name, fn in runs:
+        r = results[name] = fn()
+        print(f"  {name:<12} {r['sent']:>8,} {r['shown']:>8,} {r['skipped']:>8,} {r['peak_pending']:>11,} {r['worst_gap_ms']:>10.0f} ms {r['elapsed']:>7.1f}s")
+        del r["sent"], r["shown"], r["elapsed"]  # timing dependent, not comparable
+    return results
+
+# --- SOAK ---
+def bench_soak(args):
+    # Days of tailing compressed into a loop: batches go through a LineStore trimmed like the GUI
+    # trims it and, with a display, a real Tk Text kept at the view limit. Memory and batch latency
+    # should be flat from the first window to the last.
+    try:
+        import tkinter
+        root = tkinter.Tk(); root.withdraw(); text = tkinter.Text(root)
+    except Exception as e:
+        root = text = None; print(f"  (no display: {e}; measuring the store only)")
+    lines = sample_lines(5000); store = LineStore(); offset = 0; batch = trim = 2000
+    window = max(batch, args.soak_lines // 10); worst = total = 0.0; count = 0
+    print(f"Soak: {args.soak_lines:,} lines, view limit {args.view_max:,}, store limit {args.store_max:,}")
+    tracemalloc.start(); heaps = []; worst_all = 0.0
+    for n in range(0, args.soak_lines, batch):
+        t = time.perf_counter()
+        chunk = [lines[(n + k) % len(lines)][:-1] + "\n" for k in range(batch)]  # fresh strings, as read from the file
+        for line in chunk: store.append(line, offset); offset += len(line)
+        if text is not None:
+            shown = int(text.index("end-1c").split(".")[0]) - 1
+            if shown + batch > args.view_max + trim:
+                cut = f"{min(shown, shown + batch - args.view_max) + 1}.0"; text.delete("1.0", cut)
+            text.insert("end", "".join(chunk)); text.see("end"); root.update()
+        if len(store.texts) > args.store_max + trim: store.trim(args.store_max)
+        elapsed = time.perf_counter() - t; worst = max(worst, elapsed); total += elapsed; count += 1
+        if (n + batch) % window < batch:
+            current = tracemalloc.get_traced_memory()[0]; heaps.append(current / 1048576); worst_all = max(worst_all, worst)
+            print(f"  {n + batch:>12,} lines  heap {current / 1048576:>7.1f} MB  batch avg {total / count * 1000:>6.2f} ms  worst {worst * 1000:>7.2f} ms")
+            worst = total = 0.0; count = 0
+    peak = tracemalloc.get_traced_memory()[1]; tracemalloc.stop()
+    if root is not None: root.destroy()
+    return {"lines": args.soak_lines, "display": root is not None, "first_heap_mb": heaps[0] if heaps else 0.0, "last_heap_mb": heaps[-1] if heaps else 0.0,
+            "peak_heap_mb": peak / 1048576, "worst_batch_ms": worst_all * 1000}
+
+# --- LINE PARSING ---
+TRACEBACK = ["Traceback (most recent call last):", '  File "/storage/.kodi/addons/{a}/default.py", line 12, in <module>', "ValueError: error info in message body"]
+
+def sample_entries(count, seed=1):
+    # sample_lines in chronological order, plus Python tracebacks continuing some entries
+    out = []
+    for i, line in enumerate(sample_lines(count, seed)):
+        out.append(f"2024-05-01 {format_time(43200 + i / 100)}" + line[23:])  # 10 ms apart, in order
+        if i % 50 == 7: out += [" " * 49 + t.format(a=ADDONS[i % len(ADDONS)]) + "\n" for t in TRACEBACK]
+    return out
+
+def legacy_level(line):
+    # Substring classification of the pre-parser get_line_data
+    low = line.lower()
+    return "error" if " error " in low else "warning" if " warning " in low else "info" if " info " in low else None
+
+def bench_parse(args):
+    lines = sample_entries(args.lines); size = sum(len(l.encode("utf-8")) for l in lines)
+    print(f"Line parsing: {len(lines):,} lines ({size / 1048576:.1f} MB, with tracebacks)")
+    res = {"lines": len(lines)}
+    t = time.perf_counter(); legacy = [legacy_level(l) for l in lines]; elapsed = time.perf_counter() - t
+    res["substring_lines_per_s"] = rate(len(lines), elapsed)
+    print(f"  substring scan  {res['substring_lines_per_s']:>12,.0f} lines/s")
+    offsets = list(accumulate((len(l) for l in lines), initial=0))
+    t = time.perf_counter(); records = list(parse_lines(zip(offsets, lines))); elapsed = time.perf_counter() - t
+    res["parse_lines_per_s"] = rate(len(lines), elapsed); res["parse_mb_s"] = size / 1048576 / elapsed
+    print(f"  parse_lines     {res['parse_lines_per_s']:>12,.0f} lines/s  ({res['parse_mb_s']:,.1f} MB/s)")
+    store = LineStore(); t = time.perf_counter()
+    for off, line in zip(offsets, lines): store.append(line, off)
+    res["store_lines_per_s"] = rate(len(lines), time.perf_counter() - t)
+    print(f"  LineStore build {res['store_lines_per_s']:>12,.0f} lines/s")
+    cost = {}
+    for enabled in (False, True):
+        # what the tail thread adds per batch: one attribute test when the counters are off, two clock reads and add() when on
+        perf = PerfCounters(enabled); t0 = time.perf_counter()
+        for _ in range(100000):
+            t = time.perf_counter() if perf.enabled else None
+            if t is not None: perf.add("parse", time.perf_counter() - t, 500)
+        cost[enabled] = (time.perf_counter() - t0) / 100000
+    batch = 500 / res["store_lines_per_s"]
+    res["perf_off_pct"] = cost[False] * 100 / batch; res["perf_on_pct"] = cost[True] * 100 / batch
+    print(f"  ⏱ counters      {cost[False] * 1e9:>8,.0f} ns off, {cost[True] * 1e9:,.0f} ns on per 500-line batch ({res['perf_off_pct']:.3f}% / {res['perf_on_pct']:.3f}% of parsing it)")
+    wrong = sum(1 for rec, old in zip(records, legacy) if LEVEL_TAGS[rec.level] != old)
+    print(f"  substring scan disagrees with the parsed level on {wrong:,} lines ({sum(r.parent is not None for r in records):,} continuation lines)")
+    thread = records[0].thread; mid = format_time(records[len(records) // 2].time).split(" ")[1]
+    for label, flt in (("thread", LogFilter(None, "", None, thread)), ("error+thread", LogFilter("error", "", None, thread)), ("since " + mid, LogFilter(None, "", None, None, mid))):
+        t = time.perf_counter(); n = sum(1 for _ in store.select(flt)); elapsed = time.perf_counter() - t
+        print(f"  {label:<22} {elapsed * 1000:>9.1f} ms  ({n:,} lines)")
+        res[label.split(" ")[0].replace("+", "_") + "_filter_ms"] = elapsed * 1000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "kodi.log")
+        with open(path, "w", encoding="utf-8") as f: f.writelines(lines)
+        index = LineIndex(path); index.update(); t = time.perf_counter(); index.ensure_levels(); elapsed = time.perf_counter() - t
+        res["index_levels_lines_per_s"] = rate(index.count, elapsed)
+        print(f"  ∞ index levels  {res['index_levels_lines_per_s']:>12,.0f} lines/s  ({size / 1048576 / elapsed:,.1f} MB/s)")
+        index.close()
+    return res
+
+# --- IN-MEMORY REFILTER ---
+def bench_refilter(args):
+    lines = sample_lines(5000); store = LineStore(); offset = 0
+    t = time.perf_counter()
+    for i in range(args.store_lines):
+        line = lines[i % len(lines)]; store.append(line, offset); offset += len(line)
+    print(f"In-memory refilter: {len(store):,} stored lines (built in {time.perf_counter() - t:.1f}s)")
+    res = {"lines": len(store)}
+    for label, flt in (("all", LogFilter()), ("info", LogFilter("info")), ("warning", LogFilter("warning")), ("error", LogFilter("error")),
+                       ("search", LogFilter(None, "youtube")), ("error+search", LogFilter("error", "youtube"))):
+        t = time.perf_counter(); n = sum(1 for _ in store.select(flt)); elapsed = time.perf_counter() - t
+        print(f"  {label:<14} {elapsed * 1000:>9.1f} ms  ({n:,} lines)")
+        res[label.replace("+", "_") + "_ms"] = elapsed * 1000; res[label.replace("+", "_") + "_lines"] = n
+    return res
+
+# --- ∞ MODE INDEX ---
+def bench_index(args):
+    lines = sample_lines(5000); block = "".join(lines).encode("utf-8")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "kodi.log")
+        with open(path, "wb") as f:
+            for _ in range(max(1, args.index_mb * 1024 * 1024 // len(block))): f.write(block)
+        size = os.path.getsize(path)
+        index = LineIndex(path); t = time.perf_counter(); index.update(); build = time.perf_counter() - t
+        print(f"∞ mode index: {size / 1048576:,.0f} MB, {index.count:,} lines")
+        print(f"  build          {build * 1000:>9.1f} ms  ({size / 1048576 / build:,.0f} MB/s)")
+        res = {"lines": index.count, "build_ms": build * 1000, "build_mb_s": size / 1048576 / build}
+        for label, flt in (("error (first)", LogFilter("error")), ("warning", LogFilter("warning")), ("search", LogFilter(None, "youtube"))):
+            t = time.perf_counter(); n = len(index.select(flt)); elapsed = time.perf_counter() - t
+            print(f"  {label:<14} {elapsed * 1000:>9.1f} ms  ({n:,} lines)")
+            res[label.split(" ")[0] + "_ms"] = elapsed * 1000
+        t = time.perf_counter(); visible = [index.line(i) for i in range(index.count // 2, index.count // 2 + 60)]; elapsed = time.perf_counter() - t
+        print(f"  render 60 rows {elapsed * 1000:>9.2f} ms"); res["render_ms"] = elapsed * 1000
+        cache = IndexCache(os.path.join(tmp, "cache"))
+        t = time.perf_counter(); cache.save(index); elapsed = time.perf_counter() - t
+        print(f"  cache save     {elapsed * 1000:>9.1f} ms  ({os.path.getsize(cache.entry(path)) / 1048576:,.1f} MB)"); res["cache_save_ms"] = elapsed * 1000
+        index.close()
+        with open(path, "ab") as f: f.write(lines[0].encode("utf-8") * 100)
+        index = LineIndex(path); t = time.perf_counter(); cache.load(index); index.update(); elapsed = time.perf_counter() - t
+        print(f"  cached reopen  {elapsed * 1000:>9.1f} ms  (cache load + 100 appended lines)"); res["cached_reopen_ms"] = elapsed * 1000
+        index.close()
+        tracemalloc.start()  # separate pass: tracing slows the build down a lot
+        index = LineIndex(path); index.update(); index.ensure_levels()
+        peak = tracemalloc.get_traced_memory()[1]; tracemalloc.stop(); index.close()
+        print(f"  peak heap      {peak / 1048576:>9.1f} MB  (file mapped, not loaded)"); res["peak_heap_mb"] = peak / 1048576
+    return res
+
+# --- TAIL LATENCY ---
+def measure_tail_latency(backend, samples, seed=1):
+    # A writer appends lines stamped with perf_counter at random intervals; the reader follows the
+    # file like the monitor thread does and records the delay until each line is read.
+    rnd = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "kodi.log"); open(path, "w").close()
+        tailer = LogTailer(path, 0, backend); latencies = []; wakeups = 0
+        def writer():
+            with open(path, "a", encoding="utf-8") as f:
+                for i in range(samples):
+                    time.sleep(rnd.uniform(0.02, 0.12))
+                    f.write(f"2024-05-01 12:00:00.000 T:1 info <general>: {time.perf_counter():.6f}\n"); f.flush()
+        t = threading.Thread(target=writer, daemon=True); t.start()
+        try:
+            while len(latencies) < samples:
+                lines = tailer.read_lines()
+                if not lines: tailer.wait(1.0); wakeups += 1; continue
+                now = time.perf_counter(); latencies += [now - float(line.rsplit(" ", 1)[1]) for off, line in lines]
+        finally: tailer.close()
+        return sorted(latencies), wakeups, tailer.watcher.name
+
+def bench_latency(args):
+    print(f"Tail latency (write to line read): {args.samples} lines")
+    res = {}
+    for backend in ("polling", "inotify"):
+        try: lat, wakeups, name = measure_tail_latency(backend, args.samples)
+        except OSError as e: print(f"  {backend:<8} unavailable ({e})"); continue
+        pct = lambda p: lat[min(len(lat) - 1, int(p * len(lat)))] * 1000
+        print(f"  {name:<8} median {pct(0.5):>7.1f} ms   p95 {pct(0.95):>7.1f} ms   max {lat[-1] * 1000:>7.1f} ms   {wakeups} wakeups")
+        res[name] = {"median_ms": pct(0.5), "p95_ms": pct(0.95), "max_ms": lat[-1] * 1000}
+    return res
+
+# --- INITIAL LOAD ---
+def generated_log(data_dir, size, args):
+    # A generated log of `size` bytes; the name records the settings, so a kept --data-dir is reused
+    path = os.path.join(data_dir, f"kodi-{size}-seed{args.seed}-err{args.error_rate}.log")
+    if not os.path.exists(path):
+        print(f"  (generating {size / 1048576:,.1f} MB log...)", flush=True)
+        KodiLogGenerator(args.seed, args.error_rate, session_lines=200000).write(path + ".part", size); os.replace(path + ".part", path)
+    return path
+
+def normal_load(path):
+    # What monitor_loop does before the first lines are shown: count the lines, read the last
+    # 250 KB, keep the last 1000 lines and index the Kodi sessions in that range
+    store = LineStore(); stats = LogStats(); sessions = SessionIndex(path)
+    tailer = LogTailer(path, max(0, os.path.getsize(path) - 250000), "polling")
+    try:
+        stats.resync(path, tailer.pos); lines = tailer.read_lines()
+        for off, line in lines: stats.feed(line)
+        for off, line in lines[-1000:]: store.append(line, off)
+        stats.feed("", tailer.pos); sessions.update(tailer.pos)
+    finally: tailer.close()
+    return [store.text(i) for i, spans in store.select(LogFilter())]
+
+def infinite_load(path, cache=None):
+    # ∞ mode up to the first screen: index (or load the cached index), sessions, last 60 rows
+    index = LineIndex(path); sessions = SessionIndex(path)
+    if cache: cache.load(index, sessions)
+    index.update(); sessions.update(index.end)
+    rows = [index.line(i) for i in range(max(0, index.count - 60), index.count)]
+    return index, sessions, rows
+
+def bench_load(args):
+    sizes = [parse_size(s) for s in args.load_sizes.split(",") if s.strip()]
+    print(f"Initial load (generated logs, seed {args.seed}, {args.error_rate:.0%} errors)")
+    print(f"  {'size':>9} {'lines':>11} {'normal':>10} {'∞ first view':>13} {'∞ error filter':>15} {'∞ cached':>10} {'peak normal':>12} {'peak ∞':>10}")
+    res = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = generated_log(args.data_dir or tmp, size, args)
+            t = time.perf_counter(); normal_load(path); normal = time.perf_counter() - t
+            t = time.perf_counter(); index, sessions, rows = infinite_load(path); first = time.perf_counter() - t
+            t = time.perf_counter(); errors = len(index.select(LogFilter("error"))); error_filter = time.perf_counter() - t
+            cache = IndexCache(os.path.join(tmp, "cache")); cache.save(index, sessions); lines = index.count; index.close()
+            t = time.perf_counter(); index, sessions, rows = infinite_load(path, cache); cached = time.perf_counter() - t; index.close()
+            tracemalloc.start(); normal_load(path); peak_normal = tracemalloc.get_traced_memory()[1]; tracemalloc.stop()
+            tracemalloc.start(); index = infinite_load(path)[0]; index.ensure_levels(); peak_index = tracemalloc.get_traced_memory()[1]; tracemalloc.stop(); index.close()
+            label = f"{size / 1048576:,.1f} MB" if size >= 1048576 else f"{size / 1024:,.0f} KB"
+            print(f"  {label:>9} {lines:>11,} {normal * 1000:>7.1f} ms {first * 1000:>10.1f} ms {error_filter * 1000:>12.1f} ms {cached * 1000:>7.1f} ms "
+                  f"{peak_normal / 1048576:>9.1f} MB {peak_index / 1048576:>7.1f} MB")
+            res[label.replace(" ", "").replace(",", "")] = {"lines": lines, "error_lines": errors, "normal_ms": normal * 1000, "infinite_first_view_ms": first * 1000,
+                "infinite_error_filter_ms": error_filter * 1000, "infinite_cached_ms": cached * 1000, "normal_peak_mb": peak_normal / 1048576, "infinite_peak_mb": peak_index / 1048576}
+            if not args.data_dir: os.remove(path)
+    return res
+
+# --- LIVE APPEND ---
+def bench_live(args):
+    # The generator appends --live-rate lines/s (flushed every 50 ms, like Kodi) while the reader
+    # does what the monitor thread does with them: read, parse into the store, filter. Reports the
+    # rate the reader kept up with, how far behind the end of the file it fell and how busy it was.
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "kodi.log"); gen = KodiLogGenerator(args.seed, args.error_rate); gen.write(path, 250 * 1024)
+        tailer = LogTailer(path, os.path.getsize(path)); store = LineStore(); flt = LogFilter("warning"); sent = []
+        writer = threading.Thread(target=lambda: sent.append(gen.follow(path, args.live_rate, args.duration)), daemon=True)
+        print(f"Live append: {args.live_rate:,} lines/s for {args.duration:.0f}s ({tailer.watcher.name} watcher)")
+        processed = shown = 0; lag = busy = 0.0; start = time.perf_counter(); writer.start()
+        try:
+            while True:
+                t = time.perf_counter(); lines = tailer.read_lines()
+                if lines:
+                    for off, line in lines: shown += store.match(flt, store.append(line, off)) is not None
+                    if len(store.texts) > 202000: store.trim(200000)
+                    processed += len(lines); busy += time.perf_counter() - t
+                    lag = max(lag, os.path.getsize(path) - tailer.pos)
+                elif not writer.is_alive(): break
+                else: tailer.wait(1.0)
+        finally: tailer.close()
+        elapsed = time.perf_counter() - start
+    res = {"read_lines_per_s": rate(processed, elapsed), "max_lag_mb": lag / 1048576, "reader_busy_pct": busy / elapsed * 100}
+    print(f"  read {processed:,} lines ({res['read_lines_per_s']:,.0f}/s, {shown:,} shown)  max lag {lag / 1024:,.1f} KB  reader busy {res['reader_busy_pct']:.1f}%")
+    return res
+
+# --- FILTERED EXPORT ---
+def bench_export(args):
+    # What 💾 runs in its thread: the error lines of each --load-sizes log streamed to a file as text
+    # and as JSON lines. The peak memory should stay the same whatever the size of the log
+    sizes = [parse_size(s) for s in args.load_sizes.split(",") if s.strip()]
+    print(f"Filtered export of the error lines (generated logs, seed {args.seed}, {args.error_rate:.0%} errors)")
+    print(f"  {'size':>9} {'lines':>10} {'text':>12} {'json lines':>12} {'peak':>9}")
+    res = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = generated_log(args.data_dir or tmp, size, args); out = os.path.join(tmp, "export.out"); row = {}
+            for fmt in EXPORT_FORMATS:
+                t = time.perf_counter()
+                with open(out, "w", encoding="utf-8") as f: written = export_lines(iter_file_lines(path), LogFilter("error"), f, fmt)[0]
+                row[f"{fmt}_mb_s"] = size / 1048576 / (time.perf_counter() - t)
+            tracemalloc.start()
+            with open(out, "w", encoding="utf-8") as f: export_lines(iter_file_lines(path), LogFilter("error"), f, "jsonl")
+            row["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1048576; tracemalloc.stop(); os.remove(out)
+            row["error_lines"] = written
+            label = f"{size / 1048576:,.1f} MB" if size >= 1048576 else f"{size / 1024:,.0f} KB"
+            print(f"  {label:>9} {written:>10,} {row['text_mb_s']:>7.1f} MB/s {row['jsonl_mb_s']:>7.1f} MB/s {row['peak_mb']:>6.1f} MB")
+            res[label.replace(" ", "").replace(",", "")] = row
+            if not args.data_dir: os.remove(path)
+    return res
+
+# --- BATCH SCAN ---
+def bench_scan(args):
+    here = os.path.dirname(os.path.abspath(args.list))
+    lists = sorted(os.path.join(here, n) for n in os.listdir(here) if n.endswith(".txt"))
+    block = "".join(sample_lines(5000)).encode("utf-8")
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for n in range(args.scan_files):
+            files.append(os.path.join(tmp, f"kodi{n}.log"))
+            with open(files[-1], "wb") as f:
+                f.write(b"2024-05-01 12:00:00.000 T:1000    info <general>: Starting Kodi (21.0 (21.0.0) Git:20240405-bench). Platform: Linux x86 64-bit\n")
+                for _ in range(max(1, args.scan_mb * 1024 * 1024 // len(block))): f.write(block)
+        size = sum(os.path.getsize(p) for p in files) / 1048576
+        print(f"Batch scan: {len(files)} logs, {size:,.0f} MB, {len(lists)} keyword lists")
+        base = None; workers = 1; res = {"input_size": size}
+        while True:
+            t = time.perf_counter(); scan_logs(files, lists, workers); elapsed = time.perf_counter() - t
+            base = base or elapsed
+            print(f"  {workers:>2} worker(s) {elapsed:>8.2f} s  ({size / elapsed:>6.1f} MB/s, speedup x{base / elapsed:.2f})")
+            res[f"workers_{workers}_mb_s"] = size / elapsed
+            if workers >= args.workers: break
+            workers = min(args.workers, workers * 2)
+    return res
+
+BENCHMARKS = {"keywords": bench_keywords, "stress": bench_stress, "refilter": bench_refilter, "index": bench_index, "latency": bench_latency, "scan": bench_scan,
+              "parse": bench_parse, "soak": bench_soak, "load": bench_load, "live": bench_live, "export": bench_export}
+
+# --- RESULTS ---
+HIGHER_IS_BETTER = ("_per_s", "_mb_s")
+LOWER_IS_BETTER = ("_ms", "_s", "_mb", "_pct")
+
+def run_info(args, here):
+    try: commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=here, capture_output=True, text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError): commit = ""
+    settings = {k: v for k, v in vars(args).items() if k not in ("bench", "json", "compare", "label", "threshold", "data_dir")}
+    return {"label": args.label, "commit": commit, "time": time.strftime("%Y-%m-%d %H:%M:%S"), "python": platform.python_version(),
+            "platform": platform.platform(), "cpus": os.cpu_count(), "settings": settings}
+
+def best_of(a, b):
+    # Keeps the better value of each metric from two runs of the same benchmark
+    out = dict(a)
+    for key, value in b.items():
+        was = a.get(key)
+        if isinstance(value, dict) and isinstance(was, dict): out[key] = best_of(was, value)
+        elif isinstance(was, (int, float)) and not isinstance(was, bool) and key.endswith(HIGHER_IS_BETTER): out[key] = max(was, value)
+        elif isinstance(was, (int, float)) and not isinstance(was, bool) and key.endswith(LOWER_IS_BETTER): out[key] = min(was, value)
+    return out
+
+def flatten(results, prefix=""):
+    for key, value in results.items():
+        if isinstance(value, dict): yield from flatten(value, f"{prefix}{key}.")
+        else: yield prefix + key, value
+
+def compare(base, results, threshold):
+    run = base.get("run", {})
+    print(f"Compared with {run.get('label') or run.get('commit') or '?'} ({run.get('time', '?')}), changes over {threshold:g}% flagged")
+    old = dict(flatten(base.get("results", {})))
+    for key, value in flatten(results):
+        was = old.get(key)
+        if was is None or isinstance(value, bool) or not isinstance(value, (int, float)): continue
+        if not key.endswith(HIGHER_IS_BETTER + LOWER_IS_BETTER):
+            if value != was: print(f"  {key:<44} workload differs: {was} -> {value}")
+            continue
+        change = (value - was) / was * 100 if was else 0.0
+        better = change > 0 if key.endswith(HIGHER_IS_BETTER) else change < 0
+        flag = "" if abs(change) < threshold else "  better" if better else "  WORSE"
+        print(f"  {key:<44} {was:>12,.2f} -> {value:>12,.2f}  {change:+7.1f}%{flag}")
+
+if __name__ == "__main__":
+    here = os.path.dirname(os.path.abspath(__file__))
+    p = argparse.ArgumentParser(description="Kodi Log Monitor benchmarks")
+    p.add_argument("bench", nargs="*", help=f"benchmarks to run: {', '.join(sorted(BENCHMARKS))} (default: all)")
+    p.add_argument("--lines", type=int, default=20000)
+    p.add_argument("--list", default=os.path.join(here, "..", "keyword_lists", "Banned add-ons.txt"))
+    p.add_argument("--rate", type=int, default=20000, help="lines/sec written by the stress producer")
+    p.add_argument("--duration", type=float, default=5.0, help="seconds the stress producer runs")
+    p.add_argument("--store-lines", type=int, default=1000000, help="lines held in memory for the refilter benchmark")
+    p.add_argument("--index-mb", type=int, default=200, help="size of the generated log for the index benchmark")
+    p.add_argument("--samples", type=int, default=100, help="lines written for the latency benchmark")
+    p.add_argument("--scan-files", type=int, default=8, help="logs generated for the batch scan benchmark")
+    p.add_argument("--scan-mb", type=int, default=16, help="size of each generated log for the batch scan benchmark")
+    p.add_argument("--workers", type=int, default=os.cpu_count(), help="highest worker count tried by the batch scan benchmark")
+    p.add_argument("--soak-lines", type=int, default=2000000, help="lines pushed through the soak benchmark")
+    p.add_argument("--view-max", type=int, default=20000, help="live view limit used by the soak benchmark")
+    p.add_argument("--store-max", type=int, default=200000, help="in-memory line limit used by the soak benchmark")
+    p.add_argument("--load-sizes", default="250KB,100MB,1GB", help="comma-separated sizes of the generated logs for the load and export benchmarks")
+    p.add_argument("--live-rate", type=int, default=2000, help="lines/sec appended by the live benchmark (runs for --duration)")
+    p.add_argument("--seed", type=int, default=1, help="seed of the generated logs")
+    p.add_argument("--error-rate", type=float, default=0.02, help="share of ERROR entries in the generated logs")
+    p.add_argument("--data-dir", help="keep generated logs here and reuse them in later runs (default: temporary)")
+    p.add_argument("--json", metavar="FILE", help="save the results, machine and settings as JSON")
+    p.add_argument("--compare", metavar="FILE", help="compare with the results saved by an earlier --json run")
+    p.add_argument("--label", default="", help="name saved with the results, e.g. the version being measured")
+    p.add_argument("--repeat", type=int, default=1, help="run each benchmark this many times and keep the best value of each metric")
+    p.add_argument("--threshold", type=float, default=10.0, help="percent change flagged by --compare")
+    args = p.parse_args()
+    unknown = [b for b in args.bench if b not in BENCHMARKS]
+    if unknown: p.error(f"unknown benchmark: {', '.join(unknown)}")
+    try: [parse_size(s) for s in args.load_sizes.split(",") if s.strip()]
+    except ValueError as e: p.error(str(e))
+    if args.data_dir: os.makedirs(args.data_dir, exist_ok=True)
+    results = {}
+    for name in args.bench or sorted(BENCHMARKS):
+        for n in range(max(1, args.repeat)):
+            res = BENCHMARKS[name](args)
+            results[name] = best_of(results[name], res) if n else res
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f: json.dump({"run": run_info(args, here), "results": results}, f, indent=2)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f: compare(json.load(f), results, args.threshold)
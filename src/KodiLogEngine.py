@@ -0,0 +1,1118 @@
+import argparse
+import ctypes
+import hashlib
+import json
+import mmap
+import os
+import re
+import select
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from datetime import date
+from itertools import accumulate, compress, islice
+
+# --- KEYWORD MATCHER ---
+# Keyword lists are compiled once into a single regex built from a character trie of the
+# lowercased keywords, so a line is matched and its highlight spans found in one pass.
+# Matching runs on the lowercased line (much faster than re.IGNORECASE); lines whose
+# length changes when lowercased fall back to a case-insensitive copy of the pattern.
+# A list is only re-read when its mtime changes (or on an explicit reload).
+
+def build_trie_pattern(words):
+    trie = {}
+    for w in words:
+        node = trie
+        for ch in w: node = node.setdefault(ch, {})
+        node[""] = True
+    def emit(node):
+        end = "" in node
+        alts = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not alts: return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return f"(?:{body})?" if end else body
+    return emit(trie)
+
+class KeywordMatcher:
+    def __init__(self, path):
+        self.path = path
+        self.mtime = None
+        self.keywords = []
+        self.regex = None
+        self.regex_ic = None
+        self.regex_bytes = None
+        self.reload()
+
+    def reload(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+            with open(self.path, "r", encoding="utf-8", errors="ignore") as f: kw = [line.strip() for line in f if line.strip()]
+        except OSError: mtime, kw = None, []
+        words = {k.lower() for k in kw}
+        pattern = build_trie_pattern(words) if words else None
+        self.regex = re.compile(pattern) if pattern else None
+        self.regex_ic = re.compile(pattern, re.IGNORECASE) if pattern else None
+        self.regex_bytes = re.compile(pattern.encode("utf-8")) if pattern else None  # candidate scan over lowercased raw data
+        self.keywords = kw; self.mtime = mtime
+
+    def refresh(self):
+        try: mtime = os.path.getmtime(self.path)
+        except OSError: mtime = None
+        if mtime == self.mtime: return False
+        self.reload(); return True
+
+    def spans(self, text, low=None):
+        if self.regex is None: return []
+        if low is None: low = text.lower()
+        rx = self.regex if len(low) == len(text) else self.regex_ic
+        return [m.span() for m in rx.finditer(low if rx is self.regex else text)]
+
+_MATCHERS = {}
+
+def get_keyword_matcher(path):
+    m = _MATCHERS.get(path)
+    if m is None: m = _MATCHERS[path] = KeywordMatcher(path)
+    else: m.refresh()
+    return m
+
+def clear_keyword_cache(): _MATCHERS.clear()
+
+# --- FILE STATS ---
+# Running size/line totals for the monitored file. The full newline count is only done
+# once per (re)sync, in binary chunks; afterwards the tailing thread feeds the text it
+# reads and only those new characters are counted.
+CHUNK_SIZE = 1024 * 1024
+
+def count_newlines(path, start=0, end=None):
+    count = 0
+    with open(path, "rb") as f:
+        f.seek(start); remaining = None if end is None else max(0, end - start)
+        while remaining is None or remaining > 0:
+            block = f.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+            if not block: break
+            count += block.count(b"\n")
+            if remaining is not None: remaining -= len(block)
+    return count
+
+class LogStats:
+    def __init__(self): self.reset()
+
+    def reset(self):
+        self.size = 0; self.lines = 0; self.partial = False
+
+    def resync(self, path, upto):
+        self.reset()
+        if upto <= 0: return
+        self.lines = count_newlines(path, 0, upto); self.size = upto
+        with open(path, "rb") as f: f.seek(upto - 1); self.partial = f.read(1) != b"\n"
+
+    def feed(self, text, size=None):
+        if text:
+            n = text.count("\n"); self.lines += n
+            self.partial = not text.endswith("\n")
+        if size is not None: self.size = size
+
+    @property
+    def total_lines(self): return self.lines + (1 if self.partial else 0)
+
+# --- LINE PARSER ---
+# Kodi lines look like "2024-05-01 12:00:00.123 T:1234    info <general>: message" (v19+) or
+# "2019-05-01 12:00:00.123 T:1234  NOTICE: message" (v18 and older, v17 without the date).
+# One anchored regex match gives timestamp, thread, level and component; lines that do not
+# start with a header (Python tracebacks, multi-line messages) are continuations and take
+# the fields of the entry they belong to, so they follow their parent through every filter.
+# Times are seconds (date ordinal * 86400 + time of day) so they sort and compare as floats.
+LEVEL_NONE, LEVEL_DEBUG, LEVEL_INFO, LEVEL_NOTICE, LEVEL_WARNING, LEVEL_ERROR, LEVEL_FATAL = range(7)
+LEVEL_NAMES = ("", "debug", "info", "notice", "warning", "error", "fatal")
+LEVEL_TAGS = (None, None, "info", "info", "warning", "error", "error")
+LEVEL_CODES = dict({name: code for code, name in enumerate(LEVEL_NAMES) if name}, severe=LEVEL_ERROR)
+LEVEL_CODES_BYTES = {name.encode(): code for name, code in LEVEL_CODES.items()}
+# What each level filter shows: the GUI's INFO and ERROR buttons include NOTICE and FATAL
+LEVEL_FILTERS = {"debug": (LEVEL_DEBUG,), "info": (LEVEL_INFO, LEVEL_NOTICE), "notice": (LEVEL_NOTICE,),
+                 "warning": (LEVEL_WARNING,), "error": (LEVEL_ERROR, LEVEL_FATAL), "fatal": (LEVEL_FATAL,)}
+LINE_RE = re.compile(r"(?:(\d{4}-\d\d-\d\d) )?(\d\d:\d\d:\d\d)\.(\d{3}) T:(\d+) +([A-Za-z]+)(?: <([^<>\s]+)>)?: ")
+LINE_RE_BYTES = re.compile(LINE_RE.pattern.replace(" T:", " [Tt]:").encode())  # also runs on lowercased blocks
+ADDON_RE = re.compile(r"\[([^\]\s]+)\]")  # "[plugin.video.x] " prefix an add-on puts before its messages
+NO_TIME = float("-inf")  # stored for lines before the first timestamp; never inside a time range
+TIME_RE = re.compile(r"(?:(\d{4}-\d\d-\d\d)[ T])?(\d{1,2}):(\d\d)(?::(\d\d)(?:\.(\d{1,3}))?)?$")
+_DAYS = {None: 0}
+_CLOCKS = {}
+
+def _day_seconds(day):
+    base = _DAYS.get(day)
+    if base is None: base = _DAYS[day] = date.fromisoformat(day).toordinal() * 86400
+    return base
+
+def _clock_seconds(clock):
+    sod = _CLOCKS.get(clock)
+    if sod is None: sod = _CLOCKS[clock] = int(clock[:2]) * 3600 + int(clock[3:5]) * 60 + int(clock[6:8])
+    return sod
+
+def format_time(t):
+    if t is None: return ""
+    days, sod = divmod(t, 86400); ms = round(sod * 1000) % 1000
+    clock = f"{int(sod // 3600):02d}:{int(sod // 60 % 60):02d}:{int(sod % 60):02d}.{ms:03d}"
+    return f"{date.fromordinal(int(days)).isoformat()} {clock}" if days else clock
+
+def parse_time_bound(text, end=False):
+    # "HH:MM[:SS[.mmm]]" or "YYYY-MM-DD HH:MM[:SS]" -> (seconds, has_date); ValueError if malformed.
+    # An end bound covers the whole minute/second it names ("until 12:30" includes 12:30:59.999)
+    m = TIME_RE.match(text.strip())
+    if not m: raise ValueError(f"Invalid time: {text}")
+    day, h, mi, sec, ms = m.groups()
+    if int(h) > 23 or int(mi) > 59 or int(sec or 0) > 59: raise ValueError(f"Invalid time: {text}")
+    t = _day_seconds(day) + int(h) * 3600 + int(mi) * 60 + int(sec or 0) + int((ms or "0").ljust(3, "0")) / 1000
+    if end and not ms: t += 0.999 if sec else 59.999
+    return t, day is not None
+
+class LogRecord:
+    __slots__ = ("offset", "text", "msg_start", "time", "thread", "level", "component", "addon", "parent")
+
+    def __init__(self, offset, text, msg_start, time, thread, level, component, addon="", parent=None):
+        self.offset = offset; self.text = text; self.msg_start = msg_start; self.time = time
+        self.thread = thread; self.level = level; self.component = component; self.addon = addon; self.parent = parent
+
+    @property
+    def message(self): return self.text[self.msg_start:].rstrip("\n")
+
+def parse_line(text, offset=0, parent=None):
+    # parent: record of the previous line, inherited by continuation lines
+    m = LINE_RE.match(text)
+    if m is None:
+        if parent is None: return LogRecord(offset, text, 0, None, 0, LEVEL_NONE, "")
+        head = parent.parent or parent
+        return LogRecord(offset, text, 0, head.time, head.thread, head.level, head.component, head.addon, head)
+    day, clock, ms, thread, level, component = m.groups()
+    t = _day_seconds(day) + _clock_seconds(clock) + int(ms) / 1000
+    a = ADDON_RE.match(text, m.end()) if text.startswith("[", m.end()) else None
+    return LogRecord(offset, text, m.end(), t, int(thread), LEVEL_CODES.get(level.lower(), LEVEL_NONE), component or "", a.group(1) if a else "")
+
+def parse_lines(lines):
+    # [(offset, line)] -> LogRecord per line, continuations attached to their parent
+    prev = None
+    for off, line in lines:
+        prev = parse_line(line, off, prev); yield prev
+
+def decode_line(raw):
+    line = raw.decode("utf-8", errors="ignore")
+    return line[:-2] + "\n" if line.endswith("\r\n") else line
+
+# --- LINE FILTER ---
+# Snapshot of the level / search / keyword-list settings (plus thread and time range), so lines
+# are filtered without touching any tkinter variable. match() returns the highlight spans, or
+# None to drop the line. A time-only bound ("23:15") means the first such moment at or after
+# the start of the log; bind() resolves it once the first timestamp is known.
+# In regex mode the search is a case-insensitive pattern; compiled patterns (text and bytes
+# forms) are kept in a small LRU cache since search-as-you-type asks for the same ones again.
+SEARCH_PATTERN_CACHE = 64
+_PATTERNS = OrderedDict()
+
+def search_pattern(query):
+    # (str pattern, bytes pattern or None) for a regex search; re.error if the query is invalid
+    rx = _PATTERNS.get(query)
+    if rx is not None: _PATTERNS.move_to_end(query); return rx
+    flags = re.IGNORECASE | re.MULTILINE
+    try: raw = re.compile(query.encode("utf-8"), flags)
+    except re.error: raw = None  # some patterns only make sense on text: candidates are then found line by line
+    rx = _PATTERNS[query] = (re.compile(query, flags), raw)
+    if len(_PATTERNS) > SEARCH_PATTERN_CACHE: _PATTERNS.popitem(last=False)
+    return rx
+
+class LogFilter:
+    def __init__(self, level=None, query="", matcher=None, thread=None, since=None, until=None, regex=False):
+        self.level = LEVEL_FILTERS.get(level) if isinstance(level, str) else (level,) if isinstance(level, int) else level
+        self.regex = bool(regex and query)
+        self.query = query if self.regex else (query or "").lower()
+        self.pattern, self.pattern_bytes = search_pattern(query) if self.regex else (None, None)
+        self.matcher = matcher if matcher and matcher.regex else None
+        self.keywords = self.matcher.regex if self.matcher else None  # the matcher reloads in place: remember what it matched
+        self.thread = thread
+        self.bounds = (parse_time_bound(since) if isinstance(since, str) else since, parse_time_bound(until, True) if isinstance(until, str) else until)
+        self.lo = self.hi = None
+        self.timed = any(self.bounds)
+
+    def passes_all(self): return self.level is None and self.thread is None and not (self.timed or self.query or self.matcher)
+
+    def narrows(self, prev):
+        # True if every line passing this filter also passed prev: only the plain search text grew,
+        # so the lines prev matched can be refined instead of scanning everything again
+        if prev is None or not prev.query or self.regex or prev.regex or prev.query not in self.query: return False
+        return (self.level, self.thread, self.bounds, self.keywords) == (prev.level, prev.thread, prev.bounds, prev.keywords)
+
+    def hit(self, low):
+        # Search test on lowercased text (a block of lines or a single line)
+        return self.pattern.search(low) is not None if self.pattern else self.query in low
+
+    def bind(self, first_time):
+        # Time-only bounds take the day of the first timestamped line; lines without one (a partial
+        # first line, a traceback) cannot place them, so the bounds stay unresolved until one comes
+        if not self.timed or self.lo is not None or first_time is None or first_time == NO_TIME: return
+        def resolve(bound, default):
+            if bound is None: return default
+            value, has_date = bound
+            if has_date: return value
+            day = first_time // 86400 * 86400; value += day
+            return value + 86400 if value < int(first_time) else value
+        self.lo = resolve(self.bounds[0], float("-inf")); self.hi = resolve(self.bounds[1], float("inf"))
+
+    def accepts(self, level, thread=None, time=None):
+        if self.level is not None and level not in self.level: return False
+        if self.thread is not None and thread != self.thread: return False
+        if self.timed:
+            if self.lo is None: self.bind(time)
+            if self.lo is None or time is None or not self.lo <= time <= self.hi: return False  # NO_TIME fails too
+        return True
+
+    def spans(self, text, low=None):
+        # Highlight spans when the text passes search and keyword list, else None
+        if not (self.query or self.matcher): return []
+        if low is None: low = text.lower()
+        if self.query and not self.hit(low): return None
+        if not self.matcher: return []
+        return self.matcher.spans(text, low) or None
+
+    def match(self, text, level, low=None, thread=None, time=None):
+        return self.spans(text, low) if self.accepts(level, thread, time) else None
+
+# --- REPEAT FILTER ---
+# Collapses repeated messages: a line whose message (level, component and text, without the
+# timestamp and thread) was seen within the last `size` distinct messages and `window` seconds
+# of log time is not shown again; the shown entry's counter and last time are bumped instead.
+# An OrderedDict is both the hash lookup and the eviction order. Continuation lines (tracebacks)
+# share the fate of the entry they belong to, as long as that entry's header line was added too.
+class Repeat:
+    __slots__ = ("count", "last", "line", "mark")
+
+    def __init__(self, last):
+        self.count = 1; self.last = last; self.line = None; self.mark = None
+
+    def last_clock(self):
+        return format_time(self.last % 86400)[:8] if self.last not in (None, NO_TIME) else time.strftime("%H:%M:%S")
+
+class RepeatFilter:
+    def __init__(self, size=150, window=10.0):
+        self.size = size
+        self.window = window
+        self.clear()
+
+    def clear(self):
+        self.entries = OrderedDict(); self.current = None; self.shown = True; self.head = None
+        self.expired = []  # GUI marks of entries that left the window, for the caller to release
+
+    def add(self, text, head=None):
+        # -> (entry, shown): shown is False for a repeat, whose entry was bumped instead.
+        # head: offset of the line's header line (its own for a header); a continuation whose header
+        # was filtered out is not credited to the previous entry but stands on its own
+        m = LINE_RE.match(text)
+        if m is None and self.current is not None:
+            if head is None or head == self.head: return self.current, self.shown  # continuation
+            self.current = None
+        self.head = head
+        key = text[m.start(5):].strip() if m else text.strip()
+        if not key: return None, True
+        t = _day_seconds(m.group(1)) + _clock_seconds(m.group(2)) + int(m.group(3)) / 1000 if m else None
+        entry = self.entries.get(key)
+        if entry is not None and (t is None or entry.last is None or t - entry.last <= self.window):
+            entry.count += 1; entry.last = t; self.entries.move_to_end(key)
+            self.current = entry; self.shown = False
+            return entry, False
+        if entry is not None and entry.mark: self.expired.append(entry.mark)
+        entry = self.entries[key] = Repeat(t); self.entries.move_to_end(key)
+        if len(self.entries) > self.size:
+            old = self.entries.popitem(last=False)[1]
+            if old.mark: self.expired.append(old.mark)
+        self.current = entry; self.shown = True
+        return entry, True
+
+    def drop_before(self, line):
+        # Forgets entries whose shown line (absolute) is at or before `line`, e.g. evicted from the view
+        for key in [k for k, e in self.entries.items() if e.line is not None and e.line <= line]:
+            e = self.entries.pop(key)
+            if e.mark: self.expired.append(e.mark)
+
+# --- LINE STORE ---
+# Every line read from the log, with its byte offset and parsed fields (level code, thread,
+# time, interned component), so filter changes are a scan over memory instead of a re-read
+# of the file. Per-level index arrays make a level-only refilter proportional to the matching
+# lines, and a time range is cut out of the (chronological) times array with a bisect.
+# Line indexes are absolute: trim() drops the oldest lines and moves `base` up, so indexes
+# already queued for the GUI stay valid (those below `base` are simply gone).
+class LineStore:
+    def __init__(self):
+        self.base = 0
+        self.texts = []
+        self.offsets = array("q")
+        self.heads = array("q")  # offset of each line's header line (continuations point back to theirs)
+        self.levels = array("b")
+        self.threads = array("Q")
+        self.times = array("d")
+        self.components = array("H")
+        self.component_names = [""]
+        self.component_ids = {"": 0}
+        self.by_level = {code: array("l") for code in range(len(LEVEL_TAGS))}
+        self.last = None
+        self.first_offset = None  # offset of the first line ever appended: trimmed lines lie between it and offset(base)
+        self.lock = threading.Lock()  # append (tail thread) vs trim (GUI thread)
+
+    def __len__(self): return self.base + len(self.texts)
+
+    def append(self, text, offset, record=None):
+        rec = record or parse_line(text, offset, self.last); self.last = rec
+        if self.first_offset is None: self.first_offset = offset
+        cid = self.component_ids.get(rec.component)
+        if cid is None:
+            cid = self.component_ids[rec.component] = len(self.component_names)
+            self.component_names.append(sys.intern(rec.component))
+        with self.lock:
+            idx = self.base + len(self.texts)
+            self.offsets.append(offset); self.heads.append((rec.parent or rec).offset); self.levels.append(rec.level); self.threads.append(rec.thread)
+            self.times.append(NO_TIME if rec.time is None else rec.time); self.components.append(cid); self.by_level[rec.level].append(idx)
+            self.texts.append(text)  # appended last: a line is visible to readers once its fields are set
+        return idx
+
+    def trim(self, keep):
+        # Drops the oldest lines so that `keep` remain; returns how many were dropped
+        with self.lock:
+            n = len(self.texts) - keep
+            if n <= 0: return 0
+            for seq in (self.texts, self.offsets, self.heads, self.levels, self.threads, self.times, self.components): del seq[:n]
+            self.base += n
+            for idxs in self.by_level.values(): del idxs[:bisect_left(idxs, self.base)]
+        return n
+
+    def text(self, idx): return self.texts[idx - self.base]
+    def offset(self, idx): return self.offsets[idx - self.base]
+    def head(self, idx): return self.heads[idx - self.base]
+    def tag(self, idx): return LEVEL_TAGS[self.levels[idx - self.base]]
+    def component(self, idx): return self.component_names[self.components[idx - self.base]]
+
+    def find_offset(self, offset):
+        # Index of the line starting at a byte offset, or None if it is not held
+        k = bisect_left(self.offsets, offset)
+        return self.base + k if k < len(self.offsets) and self.offsets[k] == offset else None
+
+    def match(self, flt, idx):
+        k = idx - self.base
+        return flt.match(self.texts[k], self.levels[k], None, self.threads[k], self.times[k])
+
+    def select(self, flt, start=0, end=None, within=None):
+        # start / end are absolute indexes; yields (index, spans). within: sorted absolute indexes
+        # matched by a filter that flt narrows, so only those are checked again
+        base = self.base; end = len(self) if end is None else end
+        start = max(start, base) - base; end = max(end, base) - base
+        if flt.timed and self.texts:
+            first = bisect_right(self.times, NO_TIME)
+            if first < len(self.times): flt.bind(self.times[first])
+            if flt.lo is None: return
+            start = max(start, first, bisect_left(self.times, flt.lo, start, end)); end = max(start, bisect_right(self.times, flt.hi, start, end))
+        if within is not None:
+            texts = self.texts
+            for i in within[bisect_left(within, start + base):bisect_left(within, end + base)]:
+                spans = flt.spans(texts[i - base])
+                if spans is not None: yield i, spans
+            return
+        if flt.level is not None:
+            candidates = []
+            for code in flt.level:
+                idxs = self.by_level[code]; candidates += (i - base for i in idxs[bisect_left(idxs, start + base):bisect_left(idxs, end + base)])
+            if len(flt.level) > 1: candidates.sort()
+        elif flt.query: candidates = self.search(flt, start, end)
+        else: candidates = range(start, end)
+        if flt.thread is not None: threads = self.threads; candidates = [i for i in candidates if threads[i] == flt.thread]
+        if not flt.matcher and (not flt.query or flt.level is None):
+            for i in candidates: yield base + i, []
+            return
+        texts = self.texts
+        for i in candidates:  # level, thread and time are already narrowed above
+            spans = flt.spans(texts[i])
+            if spans is not None: yield base + i, spans
+
+    def search(self, flt, start=0, end=None, chunk=512):
+        # Blocks of lines are joined and lowercased at once so blocks without a hit are skipped
+        # cheaply; yields the (local) positions of lines passing the filter's search
+        texts = self.texts; end = len(texts) if end is None else end; hit = flt.hit
+        for a in range(start, end, chunk):
+            b = min(a + chunk, end)
+            if hit("".join(texts[a:b]).lower()): yield from (i for i in range(a, b) if hit(texts[i].lower()))
+
+# --- LINE INDEX ---
+# Memory-mapped view of a whole log: only the start offset of each line is kept in memory
+# (8 bytes per line) and line text is decoded from the mapping on demand. update() indexes
+# whatever was appended since the last call, so it serves both the initial (background)
+# build and tailing; a partially written last line is left for later.
+# Level codes and thread ids (9 bytes per line) are only parsed the first time a level or
+# thread filter needs them; a time range is found by bisecting on timestamps parsed on demand,
+# since a log is written in chronological order. Search and keyword filters scan the mapping in lowercased chunks to find candidate lines,
+# and only those candidates are decoded and checked with the LogFilter.
+INDEX_CHUNK = 4 * 1024 * 1024
+
+def lower_bytes(data):
+    # bytes.lower() only folds ASCII; other text is lowercased like the str query it is searched for.
+    # Decoding is slow, so this is only used when the query itself is not ASCII
+    return data.lower() if data.isascii() else data.decode("utf-8", errors="ignore").lower().encode("utf-8")
+
+class LineIndex:
+    def __init__(self, path):
+        self.path = path
+        self.starts = array("q")
+        self.levels = array("b")
+        self.threads = array("Q")
+        self.count = 0
+        self.end = 0
+        self.mm = None
+        self.levels_lock = threading.Lock()
+
+    def __len__(self): return self.count
+
+    def remap(self, size):
+        if size <= 0 or (self.mm is not None and len(self.mm) >= size): return
+        with open(self.path, "rb") as f: self.mm = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+
+    def update(self, progress=None, cancel=None):
+        # Returns False when the file shrank below what is indexed (truncated or replaced)
+        size = os.path.getsize(self.path)
+        if size < self.end: return False
+        self.remap(size)
+        pos = self.end
+        while pos < size:
+            if cancel and cancel(): break
+            block = self.mm[pos:min(size, pos + INDEX_CHUNK)]
+            cut = block.rfind(b"\n") + 1
+            while not cut and pos + len(block) < size:  # a single line longer than a chunk
+                block = self.mm[pos:min(size, pos + 2 * len(block))]; cut = block.rfind(b"\n") + 1
+            if not cut: break
+            lines = block[:cut].split(b"\n"); lines.pop()
+            self.starts.extend(islice(accumulate((len(line) + 1 for line in lines), initial=pos), len(lines)))
+            pos += cut; self.end = pos; self.count = len(self.starts)
+            if progress: progress(pos, size)
+        return True
+
+    def offset(self, i): return self.starts[i] if i < self.count else self.end
+
+    def raw_line(self, i): return self.mm[self.starts[i]:self.offset(i + 1)]
+    def line(self, i): return decode_line(self.raw_line(i))
+    def tag(self, i): return LEVEL_TAGS[self.level(i)]
+
+    def header(self, i, lookback=200):
+        # Header match of line i, or of the entry it continues (None if there is none nearby)
+        for j in range(i, max(-1, i - lookback), -1):
+            m = LINE_RE_BYTES.match(self.raw_line(j))
+            if m: return m
+        return None
+
+    def level(self, i):
+        if i < len(self.levels): return self.levels[i]
+        m = self.header(i)
+        return LEVEL_CODES_BYTES.get(m.group(5).lower(), LEVEL_NONE) if m else LEVEL_NONE
+
+    def time_at(self, i):
+        m = self.header(i)
+        if not m: return NO_TIME
+        day, clock, ms = m.groups()[:3]
+        return _day_seconds(day and day.decode()) + _clock_seconds(clock.decode()) + int(ms) / 1000
+
+    def bisect_time(self, t, lo, hi, right=False):
+        # First line in [lo, hi) whose time is >= t (> t when right)
+        while lo < hi:
+            mid = (lo + hi) // 2; v = self.time_at(mid)
+            if v < t or (right and v == t): lo = mid + 1
+            else: hi = mid
+        return lo
+
+    def line_at(self, offset): return max(0, bisect_right(self.starts, offset, 0, self.count) - 1)
+
+    def blocks(self, start=0, end=None, fold=False):
+        # Yields (first line number, lowercased raw chunk) for chunks of about INDEX_CHUNK bytes;
+        # only ASCII letters are lowercased unless fold is set
+        end = self.count if end is None else end
+        a = start
+        while a < end:
+            b = min(end, self.line_at(self.starts[a] + INDEX_CHUNK) + 1)
+            data = self.mm[self.starts[a]:self.offset(b)]
+            yield a, lower_bytes(data) if fold else data.lower()
+            a = b
+
+    def ensure_levels(self, cancel=None):
+        # Parses level and thread of every line not parsed yet (continuations inherit them)
+        with self.levels_lock:
+            match = LINE_RE_BYTES.match; codes = LEVEL_CODES_BYTES
+            n = len(self.levels)
+            level, thread = (self.levels[-1], self.threads[-1]) if n else (LEVEL_NONE, 0)
+            for a, block in self.blocks(n, self.count):
+                if cancel and cancel(): return False
+                levels = array("b"); threads = array("Q")
+                for l in block.split(b"\n")[:-1]:
+                    m = match(l)
+                    if m: level = codes.get(m.group(5), LEVEL_NONE); thread = int(m.group(4))
+                    levels.append(level); threads.append(thread)
+                self.threads.extend(threads); self.levels.extend(levels)  # levels last: its length marks what is parsed
+        return True
+
+    def hit_lines(self, rx, start=0, end=None, cancel=None, text_rx=None, fold=False):
+        # Lines in [start, end) where rx matches the lowercased line; newlines are counted between hits.
+        # text_rx (the str form of a regex search) is used on chunks that are not ASCII, where the bytes
+        # pattern would see one character as several bytes. fold: see blocks()
+        for a, block in self.blocks(start, end, fold):
+            if cancel and cancel(): return
+            find = rx
+            if text_rx is not None and not block.isascii(): block = block.decode("utf-8", errors="replace"); find = text_rx
+            nl = "\n" if find is text_rx else b"\n"
+            # after a hit the search resumes at the next line, so empty matches (".*", "$") cannot repeat a line
+            line = a; pos = 0; m = find.search(block)
+            while m and m.start() < len(block):  # an empty match after the last newline is not a line
+                line += block.count(nl, pos, m.start()); yield line
+                pos = block.find(nl, m.start()) + 1
+                if not 0 < pos < len(block): break
+                line += 1; m = find.search(block, pos)
+
+    def select(self, flt, start=0, end=None, cancel=None, within=None):
+        # within: sorted line numbers matched by a filter that flt narrows, so only those are checked again
+        end = self.count if end is None else end
+        if flt.passes_all(): return None
+        if flt.timed and self.count:
+            first = 0
+            while first < self.count and self.time_at(first) == NO_TIME: first += 1
+            if first < self.count: flt.bind(self.time_at(first))
+            if flt.lo is None: return array("l")
+            start = max(start, first, self.bisect_time(flt.lo, start, end)); end = max(start, self.bisect_time(flt.hi, start, end, True))
+        if within is not None:
+            out = array("l"); query = flt.query.encode("utf-8"); lower = bytes.lower if query.isascii() else lower_bytes
+            for n, i in enumerate(within[bisect_left(within, start):bisect_left(within, end)]):
+                if cancel and not n % 4096 and cancel(): break
+                if query in lower(self.raw_line(i)) and flt.spans(self.line(i)) is not None: out.append(i)
+            return out
+        if (flt.level is not None or flt.thread is not None) and not self.ensure_levels(cancel): return array("l")
+        levels = self.levels; codes = flt.level; threads = self.threads; thread = flt.thread
+        if not (flt.query or flt.matcher):
+            if codes is None and thread is None: return array("l", range(start, end))
+            keep = (lambda l, t: l in codes and t == thread) if codes is not None and thread is not None else (lambda l, t: t == thread) if codes is None else None
+            if keep is None: return array("l", compress(range(start, end), map(codes.__contains__, levels[start:end])))
+            return array("l", compress(range(start, end), map(keep, levels[start:end], threads[start:end])))
+        if flt.regex: rx = flt.pattern_bytes
+        else: rx = re.compile(re.escape(flt.query.encode("utf-8"))) if flt.query else flt.matcher.regex_bytes
+        # an ASCII query or keyword list only needs ASCII lowercasing (a regex decodes non-ASCII chunks itself)
+        fold = not flt.regex and rx is not None and not rx.pattern.isascii()
+        hits = self.hit_lines(rx, start, end, cancel, flt.pattern, fold) if rx is not None else range(start, end)
+        out = array("l")
+        for n, i in enumerate(hits):
+            if cancel and not n % 1000 and cancel(): break
+            if codes is not None and levels[i] not in codes: continue
+            if thread is not None and threads[i] != thread: continue
+            if flt.spans(self.line(i)) is not None: out.append(i)
+        return out
+
+    def close(self):
+        self.mm = None
+
+# --- SESSION INDEX ---
+# Every Kodi start writes a banner block: a "-----" line, "Starting Kodi (<version>). Platform:
+# <platform>", build / OS lines, the special:// paths, and a closing "-----" line. update()
+# looks for banners with a plain byte search over what was appended since the last call, so
+# the index is built while the log is loaded or tailed and the summary never re-reads the file.
+# A session whose block (or Python version) is not fully written yet is parsed again later.
+SESSION_MARK = b"Starting Kodi ("
+SESSION_LOOKAHEAD = 256 * 1024   # bytes after a banner searched for the session's fields
+SESSION_FIELDS = {
+    "version": re.compile(r"Starting Kodi \((.*?)\)(?:\. Platform: (.*))?$", re.MULTILINE),
+    "system": re.compile(r"Running on (.*)$", re.MULTILINE),
+    "profile": re.compile(r"special://(?:master)?profile/ is mapped to: (.*)$", re.MULTILINE),
+    "python": re.compile(r"\bPython (?:interpreter )?(?:version:? )?(\d+\.\d+(?:\.\d+)?)|xbmc\.python v(\d[\d.]*)"),
+}
+
+class Session:
+    __slots__ = ("offset", "end", "time", "version", "platform", "system", "python", "profile", "complete")
+
+    def __init__(self, offset):
+        self.offset = offset; self.end = None; self.time = None; self.complete = False
+        self.version = self.platform = self.system = self.python = self.profile = ""
+
+    def label(self):
+        return f"{format_time(self.time) if self.time != NO_TIME else '?'}  Kodi {self.version or '?'}" + (f"  ({self.platform})" if self.platform else "")
+
+def _dash_line(line): return line.rstrip().endswith(b"-----")
+
+class SessionIndex:
+    def __init__(self, path):
+        self.path = path
+        self.sessions = []
+        self.scanned = 0
+
+    def __len__(self): return len(self.sessions)
+
+    def update(self, upto=None):
+        # Indexes [scanned, upto) (default: end of file); True when sessions were added or completed
+        size = os.path.getsize(self.path)
+        upto = size if upto is None else min(upto, size)
+        if upto < self.scanned: self.sessions = []; self.scanned = 0  # truncated
+        changed = False
+        with open(self.path, "rb") as f:
+            pos = max(0, self.scanned - len(SESSION_MARK) + 1)
+            while pos < upto:
+                f.seek(pos); block = f.read(min(CHUNK_SIZE, upto - pos)); hit = block.find(SESSION_MARK)
+                while hit >= 0:
+                    self.sessions.append(Session(pos + hit)); changed = True
+                    hit = block.find(SESSION_MARK, hit + 1)
+                if pos + len(block) >= upto: break
+                pos += len(block) - len(SESSION_MARK) + 1
+            self.scanned = upto
+            for s in self.sessions:
+                if not s.complete: changed |= self.parse(f, s, upto)
+        return changed
+
+    def parse(self, f, s, upto):
+        # s.offset points at the banner text; move it to the start of the block (the dash line above)
+        # and read the fields that are already written
+        if s.time is None:
+            lo = max(0, s.offset - 4096); f.seek(lo); head = f.read(s.offset - lo)
+            line_start = lo + head.rfind(b"\n") + 1
+            f.seek(line_start); s.time = parse_line(decode_line(f.readline())).time
+            if s.time is None: s.time = NO_TIME
+            prev_start = lo + head.rfind(b"\n", 0, line_start - lo - 1) + 1
+            s.offset = prev_start if line_start > 0 and _dash_line(head[prev_start - lo:line_start - lo]) else line_start
+        f.seek(s.offset); data = f.read(min(SESSION_LOOKAHEAD, upto - s.offset))
+        data = data[:data.rfind(b"\n") + 1]
+        nxt = data.find(SESSION_MARK, 4096)  # the next session's banner bounds this one
+        if nxt > 0: data = data[:data.rfind(b"\n", 0, nxt) + 1]
+        if s.end is None:
+            lines = data.split(b"\n"); off = 0
+            for i, line in enumerate(lines[:-1]):
+                off += len(line) + 1
+                if i and _dash_line(line): s.end = s.offset + off; break
+        text = data.decode("utf-8", errors="ignore")
+        m = SESSION_FIELDS["version"].search(text)
+        if m: s.version = m.group(1); s.platform = (m.group(2) or "").strip()
+        for key in ("system", "profile"):
+            m = SESSION_FIELDS[key].search(text)
+            if m: setattr(s, key, m.group(1).strip())
+        m = SESSION_FIELDS["python"].search(text)
+        if m: s.python = m.group(1) or f"API {m.group(2)}"
+        s.complete = s.end is not None and bool(s.python) or nxt > 0 or len(data) >= SESSION_LOOKAHEAD - 65536
+        return True
+
+    def text(self, s):
+        # The session's banner block, for the summary
+        with open(self.path, "rb") as f:
+            f.seek(s.offset); data = f.read((s.end or s.offset + 8192) - s.offset)
+        return data.decode("utf-8", errors="ignore").replace("\r\n", "\n")
+
+# --- INDEX CACHE ---
+# Sidecar cache of a LineIndex (line offsets, plus the level codes and thread ids parsed so far)
+# and of its SessionIndex, one file per log in a cache directory, so reopening a large log only
+# indexes what was appended since it was saved. A cache is used only if the log is the same file
+# (device and inode), is not shorter than what was indexed, has the same mtime when its size did
+# not change, and still starts and ends (at the indexed length) with the same bytes.
+# File layout: magic, metadata length, JSON metadata, then the raw arrays in native byte order.
+# The least recently used cache files are deleted once the directory exceeds max_bytes.
+INDEX_CACHE_MAGIC = b"KLMIDX1\n"
+INDEX_CACHE_PROBE = 64 * 1024    # bytes hashed at the head and before the indexed end of the log
+
+def _probe_hash(f, start, length):
+    f.seek(start); return hashlib.sha1(f.read(length)).hexdigest()
+
+class IndexCache:
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.dir = directory
+        self.max_bytes = max_bytes
+
+    def entry(self, path):
+        return os.path.join(self.dir, hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:20] + ".idx")
+
+    def load(self, index, sessions=None):
+        # Fills an empty index (and session index) from the cache; False if there is no valid cache
+        entry = self.entry(index.path)
+        try:
+            with open(entry, "rb") as c:
+                if c.read(len(INDEX_CACHE_MAGIC)) != INDEX_CACHE_MAGIC: return False
+                meta = json.loads(c.read(struct.unpack("<I", c.read(4))[0]))
+                if meta["path"] != os.path.abspath(index.path) or meta["byteorder"] != sys.byteorder: return False
+                with open(index.path, "rb") as f:
+                    st = os.fstat(f.fileno()); end = meta["end"]
+                    if [st.st_dev, st.st_ino] != meta["ident"] or st.st_size < end: return False
+                    if st.st_size == end and st.st_mtime_ns != meta["mtime"]: return False
+                    head = min(end, INDEX_CACHE_PROBE); tail = max(head, end - INDEX_CACHE_PROBE)
+                    if _probe_hash(f, 0, head) != meta["head"] or _probe_hash(f, tail, end - tail) != meta["tail"]: return False
+                starts = array("q"); levels = array("b"); threads = array("Q")
+                starts.fromfile(c, meta["count"]); levels.fromfile(c, meta["levels"]); threads.fromfile(c, meta["levels"])
+        except (OSError, ValueError, KeyError, EOFError, struct.error): return False
+        index.starts = starts; index.levels = levels; index.threads = threads; index.count = len(starts); index.end = end
+        if sessions is not None:
+            sessions.sessions = []
+            for values in meta["sessions"]:
+                s = Session(values["offset"])
+                for key in Session.__slots__: setattr(s, key, values[key])
+                sessions.sessions.append(s)
+            sessions.scanned = min(meta["scanned"], end)
+        try: os.utime(entry)  # recently used
+        except OSError: pass
+        return True
+
+    def save(self, index, sessions=None):
+        # Writes the current state of the index (to a temporary file first, so a reader never sees half a cache).
+        # Call it from the thread that updates the index: count and end must not move while they are read
+        count, end = index.count, index.end
+        if not count: return False
+        with index.levels_lock: levels = index.levels[:count]; threads = index.threads[:len(levels)]
+        try:
+            os.makedirs(self.dir, exist_ok=True)
+            with open(index.path, "rb") as f:
+                st = os.fstat(f.fileno())
+                head = min(end, INDEX_CACHE_PROBE); tail = max(head, end - INDEX_CACHE_PROBE)
+                meta = {"path": os.path.abspath(index.path), "ident": [st.st_dev, st.st_ino], "end": end, "mtime": st.st_mtime_ns,
+                        "head": _probe_hash(f, 0, head), "tail": _probe_hash(f, tail, end - tail), "byteorder": sys.byteorder,
+                        "count": count, "levels": len(levels), "scanned": sessions.scanned if sessions is not None else 0,
+                        "sessions": [{key: getattr(s, key) for key in Session.__slots__} for s in sessions.sessions] if sessions is not None else []}
+            entry = self.entry(index.path); tmp = entry + ".tmp"
+            with open(tmp, "wb") as c:
+                data = json.dumps(meta).encode("utf-8")
+                c.write(INDEX_CACHE_MAGIC); c.write(struct.pack("<I", len(data))); c.write(data)
+                index.starts[:count].tofile(c); levels.tofile(c); threads.tofile(c)
+            os.replace(tmp, entry)
+        except OSError: return False
+        self.prune(keep=entry)
+        return True
+
+    def prune(self, keep=None):
+        # Deletes the least recently used cache files until the directory fits in max_bytes
+        try: entries = [e for e in os.scandir(self.dir) if e.name.endswith(".idx")]
+        except OSError: return
+        stats = sorted(((e.stat().st_mtime, e.stat().st_size, e.path) for e in entries), reverse=True)
+        total = 0
+        for mtime, size, path in stats:
+            if total + size > self.max_bytes and path != keep:
+                try: os.remove(path); continue
+                except OSError: pass
+            total += size
+
+# --- FILE WATCHERS ---
+# wait() returns once the log may have changed (or after the timeout). The inotify backend
+# watches the log's directory, so it also wakes when Kodi renames the log and creates a new
+# one; the polling backend just sleeps, as the monitor always did.
+WATCHER_BACKENDS = ("auto", "inotify", "polling")
+POLL_INTERVAL = 0.4
+
+class PollingWatcher:
+    name = "polling"
+
+    def __init__(self, path, interval=POLL_INTERVAL): self.interval = interval
+
+    def wait(self, timeout=None):
+        time.sleep(self.interval if timeout is None else min(self.interval, timeout)); return True
+
+    def close(self): pass
+
+class InotifyWatcher:
+    name = "inotify"
+    IN_MODIFY, IN_CLOSE_WRITE, IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x2, 0x8, 0x40, 0x80, 0x100, 0x200
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, path):
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0: raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_FROM | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE
+        folder = os.path.dirname(os.path.abspath(path))
+        if libc.inotify_add_watch(self.fd, os.fsencode(folder), mask) < 0:
+            err = ctypes.get_errno(); os.close(self.fd); raise OSError(err, f"inotify_add_watch failed for {folder}")
+        self.name_b = os.fsencode(os.path.basename(path))
+
+    def wait(self, timeout=None):
+        # True when an event concerned the log file itself
+        if not select.select([self.fd], [], [], timeout)[0]: return False
+        hit = False
+        while True:
+            try: data = os.read(self.fd, 65536)
+            except BlockingIOError: break
+            pos = 0
+            while pos + self.EVENT.size <= len(data):
+                wd, mask, cookie, length = self.EVENT.unpack_from(data, pos); pos += self.EVENT.size
+                hit = hit or data[pos:pos + length].rstrip(b"\0") == self.name_b; pos += length
+        return hit
+
+    def close(self):
+        if self.fd >= 0: os.close(self.fd); self.fd = -1
+
+def make_watcher(path, backend="auto"):
+    if backend not in WATCHER_BACKENDS: raise ValueError(f"Unknown watcher backend: {backend}")
+    if backend in ("auto", "inotify") and sys.platform.startswith("linux"):
+        try: return InotifyWatcher(path)
+        except (OSError, AttributeError):
+            if backend == "inotify": raise
+    elif backend == "inotify": raise OSError("inotify is only available on Linux")
+    return PollingWatcher(path)
+
+def file_identity(path_or_fd):
+    st = os.fstat(path_or_fd) if isinstance(path_or_fd, int) else os.stat(path_or_fd)
+    return st.st_dev, st.st_ino
+
+# --- TAILER ---
+# Follows a log from a byte offset. New data is read in large chunks and only complete lines
+# are returned; rotation is detected by the path pointing to another file (device/inode),
+# truncation by the file becoming shorter than what was read.
+READ_CHUNK = 1024 * 1024
+
+class LogTailer:
+    def __init__(self, path, pos=0, backend="auto"):
+        self.path = path
+        self.f = open(path, "rb"); self.f.seek(pos)
+        self.pos = pos
+        self.pending = b""
+        self.ident = file_identity(self.f.fileno())
+        self.watcher = make_watcher(path, backend)
+
+    def read_lines(self, limit=None):
+        # [(offset, line)] for the complete lines appended since the last call; with a limit, returns
+        # once about that many bytes were read (the rest comes with the next calls)
+        out = []; start = self.pos
+        while True:
+            data = self.f.read(READ_CHUNK)
+            if not data: return out
+            buf = self.pending + data; cut = buf.rfind(b"\n") + 1
+            self.pending = buf[cut:]
+            if not cut: continue
+            off = self.pos
+            for raw in buf[:cut - 1].split(b"\n"):
+                line = raw.decode("utf-8", errors="ignore")
+                out.append((off, (line[:-1] if line.endswith("\r") else line) + "\n")); off += len(raw) + 1
+            self.pos = off
+            if limit and off - start >= limit: return out
+
+    def flush(self):
+        # The unterminated last line, for callers that stop at end of file
+        if not self.pending: return []
+        line = self.pending.decode("utf-8", errors="ignore"); off = self.pos
+        self.pos += len(self.pending); self.pending = b""
+        return [(off, line + "\n")]
+
+    def changed(self):
+        # "replaced" once the path is a new file or was truncated, "missing" while it does not exist
+        try: st = os.stat(self.path)
+        except OSError: return "missing"
+        if (st.st_dev, st.st_ino) != self.ident or st.st_size < self.pos + len(self.pending): return "replaced"
+        return None
+
+    def wait(self, timeout=None): return self.watcher.wait(timeout)
+
+    def close(self):
+        self.f.close(); self.watcher.close()
+
+# --- LINE QUEUE ---
+# Bounded hand-off between the tailing thread and the UI, which drains it in batches.
+# When full, "block" makes the producer wait, "drop_oldest" discards the oldest queued
+# line and "summarize" discards incoming lines; dropped lines are counted either way.
+QUEUE_POLICIES = ("block", "drop_oldest", "summarize")
+
+class LineQueue:
+    def __init__(self, maxsize=5000, policy="summarize"):
+        if policy not in QUEUE_POLICIES: raise ValueError(f"Unknown queue policy: {policy}")
+        self.maxsize = maxsize; self.policy = policy
+        self.items = deque(); self.skipped = 0
+        self.cond = threading.Condition()
+
+    def put(self, item, timeout=None):
+        with self.cond:
+            if len(self.items) >= self.maxsize:
+                if self.policy == "block":
+                    if not self.cond.wait_for(lambda: len(self.items) < self.maxsize, timeout): return False
+                elif self.policy == "drop_oldest": self.items.popleft(); self.skipped += 1
+                else: self.skipped += 1; return True
+            self.items.append(item)
+            return True
+
+    def drain(self, limit=None):
+        with self.cond:
+            n = len(self.items) if limit is None else min(limit, len(self.items))
+            batch = [self.items.popleft() for _ in range(n)]
+            skipped, self.skipped = self.skipped, 0
+            self.cond.notify_all()
+        return batch, skipped
+
+    def __len__(self): return len(self.items)
+
+# --- PERF COUNTERS ---
+# Time spent in each stage of the hot path (read, parse, filter, highlight, GUI insert, stats),
+# plus the lines and bytes read. Callers time a whole batch, and only when .enabled is set, so a
+# switched-off counter costs one attribute test per batch. rates() turns the totals into a live
+# view (ms spent per second, lines/s, bytes/s since the previous call); snapshot() is the report.
+PERF_STAGES = ("read", "parse", "filter", "highlight", "insert", "stats")
+
+class PerfCounters:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.lock = threading.Lock()  # stages are timed on the tail thread and the GUI thread
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.seconds = dict.fromkeys(PERF_STAGES, 0.0); self.calls = dict.fromkeys(PERF_STAGES, 0); self.worst = dict.fromkeys(PERF_STAGES, 0.0)
+            self.lines = self.bytes = 0; self.started = time.perf_counter(); self.last = None
+
+    def add(self, stage, seconds, lines=0, nbytes=0):
+        with self.lock:
+            self.seconds[stage] += seconds; self.calls[stage] += 1
+            if seconds > self.worst[stage]: self.worst[stage] = seconds
+            self.lines += lines; self.bytes += nbytes
+
+    def rates(self):
+        with self.lock: now = time.perf_counter(); snap = (now, dict(self.seconds), self.lines, self.bytes)
+        prev = self.last or (self.started, dict.fromkeys(PERF_STAGES, 0.0), 0, 0); self.last = snap
+        dt = max(1e-9, now - prev[0])
+        return {stage: (snap[1][stage] - prev[1][stage]) * 1000 / dt for stage in PERF_STAGES}, (snap[2] - prev[2]) / dt, (snap[3] - prev[3]) / dt
+
+    def snapshot(self):
+        with self.lock:
+            elapsed = max(1e-9, time.perf_counter() - self.started)
+            stages = {stage: {"calls": self.calls[stage], "total_ms": self.seconds[stage] * 1000, "worst_ms": self.worst[stage] * 1000,
+                              "avg_ms": self.seconds[stage] * 1000 / self.calls[stage] if self.calls[stage] else 0.0} for stage in PERF_STAGES}
+            return {"elapsed_s": elapsed, "lines": self.lines, "bytes": self.bytes, "lines_per_s": self.lines / elapsed, "bytes_per_s": self.bytes / elapsed, "stages": stages}
+
+class SamplingProfiler:
+    # Samples the stacks of all other threads every `interval` seconds from a daemon thread and
+    # counts the collapsed stacks (root first, as flamegraph tools expect); nothing runs until start()
+    def __init__(self, interval=0.005, depth=48):
+        self.interval = interval
+        self.depth = depth
+        self.stacks = {}
+        self.samples = 0
+        self.started = self.stopped = None
+        self.done = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.started = time.perf_counter(); self.done.clear()
+        self.thread = threading.Thread(target=self.run, name="SamplingProfiler", daemon=True); self.thread.start()
+
+    def stop(self):
+        self.done.set()
+        if self.thread: self.thread.join(1.0)
+        self.stopped = time.perf_counter()
+        return self.report()
+
+    def run(self):
+        me = threading.get_ident(); stacks = self.stacks
+        while not self.done.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me: continue
+                stack = []
+                while frame is not None and len(stack) < self.depth:
+                    code = frame.f_code; stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"); frame = frame.f_back
+                key = (names.get(ident, str(ident)), ";".join(reversed(stack)))
+                stacks[key] = stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def report(self, top=30):
+        # Sample counts per thread, the functions most often running (self) or on the stack (total), and the stacks
+        threads = {}; own = {}; total = {}
+        for (thread, stack), n in self.stacks.items():
+            threads[thread] = threads.get(thread, 0) + n
+            frames = stack.split(";"); own[frames[-1]] = own.get(frames[-1], 0) + n
+            for f in set(frames): total[f] = total.get(f, 0) + n
+        samples = max(1, sum(threads.values()))
+        ranked = lambda counts: [{"function": f, "samples": n, "pct": n * 100 / samples} for f, n in sorted(counts.items(), key=lambda kv: -kv[1])[:top]]
+        return {"interval_ms": self.interval * 1000, "duration_s": (self.stopped or time.perf_counter()) - (self.started or time.perf_counter()),
+                "ticks": self.samples, "threads": threads, "top_self": ranked(own), "top_total": ranked(total),
+                "stacks": [{"thread": t, "stack": st, "count": n} for (t, st), n in sorted(self.stacks.items(), key=lambda kv: -kv[1])]}
+
+# --- STREAMING ---
+# GUI-free pipeline: lines from a file (optionally followed like tail -f) or a stream are
+# run through a LogFilter; the GUI uses the same filter, matcher and tailer.
+def iter_file_lines(path, follow=False, backend="auto", stop=None, start=0):
+    # (offset, line) for every line of the file from byte offset start (a line start); in follow mode
+    # keeps waiting for new lines and starts over from the top when Kodi replaces the log
+    while True:
+        tailer = LogTailer(path, start, backend if follow else "polling"); start = 0
+        try:
+            while True:
+                lines = tailer.read_lines(READ_CHUNK)
+                if lines: yield from lines; continue
+                if not follow: yield from tailer.flush(); return
+                if stop and stop(): return
+                if tailer.changed() == "replaced": break
+                tailer.wait(1.0)
+        finally: tailer.close()
+
+def iter_stream_lines(stream):
+    off = 0
+    for raw in stream:
+        line = raw.decode("utf-8", errors="ignore")
+        yield off, (line[:-2] + "\n" if line.endswith("\r\n") else line if line.endswith("\n") else line + "\n"); off += len(raw)
+
+def filter_lines(lines, flt):
+    # (line number, LogRecord, spans) for the lines passing the filter
+    for n, rec in enumerate(parse_lines(lines), 1):
+        if not flt.accepts(rec.level, rec.thread, rec.time): continue
+        spans = flt.spans(rec.text)
+        if spans is not None: yield n, rec, spans
+
+def line_record(n, rec, spans):
+    line = rec.text
+    return {"line": n, "offset": rec.offset, "time": format_time(rec.time), "thread": rec.thread, "level": LEVEL_NAMES[rec.level],
+            "component": rec.component, "addon": rec.addon, "continuation": rec.parent is not None, "message": rec.message,
+            "keywords": sorted({line[a:b] for a, b in spans}, key=str.lower)}
+
+EXPORT_FORMATS = ("text", "jsonl")
+EXPORT_CHUNK_LINES = 10000
+
+def export_lines(lines, flt, out, fmt="text", progress=None, cancel=None):
+    # Writes the lines passing flt to out as plain text or JSON lines (line_record), in chunks so a
+    # whole log is exported in constant memory. progress(offset, written) is called and cancel()
+    # checked every EXPORT_CHUNK_LINES lines read; returns (lines written, False if cancelled)
+    buf = []; written = 0; jsonl = fmt == "jsonl"
+    for n, rec in enumerate(parse_lines(lines), 1):
+        if flt.accepts(rec.level, rec.thread, rec.time):
+            spans = flt.spans(rec.text)
+            if spans is not None: buf.append(json.dumps(line_record(n, rec, spans), ensure_ascii=False) + "\n" if jsonl else rec.text)
+        if n % EXPORT_CHUNK_LINES == 0:
+            if buf: out.write("".join(buf)); written += len(buf); buf = []
+            if progress: progress(rec.offset + len(rec.text), written)
+            if cancel and cancel(): return written, False
+    if buf: out.write("".join(buf)); written += len(buf)
+    return written, True
+
+def resolve_keyword_list(name, keyword_dir="keyword_lists"):
+    if os.path.isfile(name): return name
+    path = os.path.join(keyword_dir, name if name.endswith(".txt") else f"{name}.txt")
+    if not os.path.isfile(path): raise FileNotFoundError(f"Keyword list not found: {name}")
+    return path
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="KodiLogEngine", description="Filter a Kodi log without the GUI (same filters as Kodi Log Monitor).")
+    p.add_argument("log", nargs="?", default="-", help="log file, or - for stdin (default)")
+    p.add_argument("-l", "--level", choices=["all"] + list(LEVEL_FILTERS), default="all", help="info includes notice, error includes fatal")
+    p.add_argument("-s", "--search", default="", help="case-insensitive text the line must contain")
+    p.add_argument("-r", "--regex", action="store_true", help="treat --search as a (case-insensitive) regular expression")
+    p.add_argument("-k", "--list", help="keyword list name (from --keyword-dir) or path to a .txt list")
+    p.add_argument("--keyword-dir", default="keyword_lists")
+    p.add_argument("-t", "--thread", type=int, help="only lines logged by this thread id (the number after T:)")
+    p.add_argument("--since", help="start time: HH:MM[:SS] or 'YYYY-MM-DD HH:MM[:SS]'")
+    p.add_argument("--until", help="end time, same formats as --since (inclusive)")
+    p.add_argument("-j", "--json", action="store_true", help="write JSON lines instead of plain text")
+    p.add_argument("-f", "--follow", action="store_true", help="keep following the file as Kodi writes it (like tail -f)")
+    p.add_argument("--watcher", choices=WATCHER_BACKENDS, default="auto", help="how to wait for new data in follow mode")
+    args = p.parse_args(argv)
+    try:
+        matcher = KeywordMatcher(resolve_keyword_list(args.list, args.keyword_dir)) if args.list else None
+        try: flt = LogFilter(args.level, args.search, matcher, args.thread, args.since, args.until, args.regex)
+        except re.error as e: p.error(f"invalid --search pattern: {e}")
+        except ValueError as e: p.error(str(e))
+        lines = iter_stream_lines(sys.stdin.buffer) if args.log == "-" else iter_file_lines(args.log, args.follow, args.watcher)
+        out = sys.stdout
+        if not args.follow: export_lines(lines, flt, out, "jsonl" if args.json else "text")
+        else:
+            for n, rec, spans in filter_lines(lines, flt):
+                out.write(json.dumps(line_record(n, rec, spans), ensure_ascii=False) + "\n" if args.json else rec.text); out.flush()
+        out.flush()
+    except KeyboardInterrupt: return 130
+    except BrokenPipeError:
+        sys.stdout = None  # output closed early (e.g. piped into head)
+        return 0
+    except OSError as e:
+        print(f"KodiLogEngine: {e}", file=sys.stderr); return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
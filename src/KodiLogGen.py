@@ -0,0 +1,169 @@
+import argparse
+import random
+import re
+import sys
+import time
+from datetime import date
+
+# --- LOG GENERATOR ---
+# Writes realistic Kodi logs for benchmarks and manual testing: startup banners (one per
+# session), mixed levels, add-on messages with their [addon.id] prefix, Python tracebacks
+# continuing an error entry, bursts of repeated messages and a few non-ASCII paths.
+# Everything comes from one seeded random.Random, so the same settings give the same bytes.
+# Timestamps are kept in integer milliseconds and move forward a few ms per line.
+GEN_START = "2024-05-01 08:00:00"
+DASHES = "-" * 69
+
+THREADS = [1284, 1289, 1301, 1318, 1322, 1337, 1402, 1455, 1493, 1520, 1617, 1688, 1724, 1781]
+ADDONS = ["plugin.video.youtube", "script.module.requests", "plugin.video.alluneed", "skin.estuary", "pvr.iptvsimple",
+          "plugin.video.balkan.green", "service.subtitles.a4ksubtitles", "script.skinshortcuts", "plugin.audio.radio_de", "metadata.tvshows.themoviedb.org.python"]
+COMPONENTS = ["general"] * 12 + ["CAddonMgr", "CPythonInvoker", "CVideoDatabase", "CCurlFile", "CActiveAE", "CSettingsManager"]
+PATHS = ["/storage/videos/Films/Amélie (2001).mkv", "/storage/music/Björk/Homogenic/01 Hunter.flac", "/storage/videos/Séries/Lupin/S01E01.mkv",
+         "/home/kodi/Videos/Movies/Spirited Away (2001).mkv", "smb://nas/media/TV/The Office/S02E03.mkv", "/storage/videos/日本/東京物語 (1953).mkv"]
+MESSAGES = {
+    "debug": ["CurlFile::Open - {u}", "CVideoDatabase::GetFileId ({p})", "ffmpeg[{t}]: [hevc] Could not find ref with POC 12", "CGUIWindowManager::Process - activating window {n}",
+              "[{a}] Reading settings for {a}", "CSettingsManager: requested setting (videoplayer.seeksteps) changed", "CApplication::OnAction action {n} button 0"],
+    "info": ["CAddonMgr::FindAddon: {a} v{v} installed", "Loading skin file: DialogBusy.xml, load type: KEEP_IN_MEMORY", "[{a}] Started {a} v{v}",
+             "CVideoPlayer::OpenFile: {p}", "VideoPlayer::OpenFile: {p}", "Creating InputStream", "CPythonInvoker({n}, {s}): script successfully run",
+             "[{a}] Successfully updated channels ({n})", "PVRManager - {a} - started"],
+    "warning": ["CSkinInfo: failed to load skin settings", "[{a}] Deprecated call: use xbmcvfs.translatePath instead", "CGUIMediaWindow::GetDirectory({u}) failed",
+                "CDVDDemuxFFmpeg::Open - avformat_find_stream_info starting", "GetDirectory - Error getting {u}", "Previous line repeats 3 times."],
+    "error": ["CCurlFile::Open failed with code 404 for {u}", "GetDirectory - Error getting {u}", "[{a}] Failed to get playlist: HTTP 503",
+              "CAddonMgr: {a} failed to load: unmet dependency script.module.six", "Skin Helper: unmatched parentheses in expression for {a}",
+              "CVideoDatabase::GetMovieId ({p}) - no match"],
+}
+TRACEBACK_HEAD = "EXCEPTION Thrown (PythonToCppException) : -->Python callback/script returned the following error<--"
+TRACEBACK = ["- NOTE: IGNORING THIS CAN LEAD TO MEMORY LEAKS!", "Error Type: <class '{e}'>", "Error Contents: {m}", "Traceback (most recent call last):",
+             '  File "{s}", line {n}, in <module>', "    main()", '  File "{s}", line {k}, in main', "    {m}", "{e}: {m}", "-->End of Python script error report<--"]
+EXCEPTIONS = [("KeyError", "'stream'"), ("TypeError", "'NoneType' object is not subscriptable"), ("ValueError", "invalid literal for int() with base 10: ''"),
+              ("ConnectionError", "HTTPSConnectionPool(host='api.example.com', port=443): Max retries exceeded")]
+
+def parse_size(text):
+    # "250KB", "100MB", "1GB", "1.5G" or a plain number of bytes
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)B?\s*", str(text), re.IGNORECASE)
+    if not m: raise ValueError(f"Invalid size: {text}")
+    return int(float(m.group(1)) * 1024 ** " KMGT".index(m.group(2).upper() or " "))
+
+class KodiLogGenerator:
+    def __init__(self, seed=1, error_rate=0.02, warning_rate=0.05, debug_rate=0.4, traceback_rate=0.25, repeat_rate=0.05,
+                 session_lines=0, start=GEN_START, kodi_version="21.0 (21.0.0) Git:20240405-bench"):
+        self.rnd = random.Random(seed)
+        self.rates = (error_rate, warning_rate, debug_rate)
+        self.traceback_rate = traceback_rate    # share of errors followed by a Python traceback
+        self.repeat_rate = repeat_rate          # chance a message is logged again right away (a burst of repeats)
+        self.session_lines = session_lines      # a Kodi restart (new banner) every this many lines (0 = one session)
+        self.kodi_version = kodi_version
+        day, clock = start.split(" ")
+        self.now = date.fromisoformat(day).toordinal() * 86400000 + sum(int(x) * m for x, m in zip(clock.split(":"), (3600000, 60000, 1000)))
+        self.lines = 0
+        self.stream = self.entries()  # shared by write() and follow(), so appending continues the same log
+
+    def stamp(self):
+        days, ms = divmod(self.now, 86400000); s, ms = divmod(ms, 1000)
+        return f"{date.fromordinal(days).isoformat()} {s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}.{ms:03d}"
+
+    def header(self, level, thread, component="general"):
+        return f"{self.stamp()} T:{thread} {level:>7} <{component}>: "
+
+    def banner(self):
+        rnd = self.rnd; h = self.header("info", THREADS[0])
+        lines = [DASHES, f"Starting Kodi ({self.kodi_version}). Platform: Linux x86 64-bit", "Using Release Kodi x64",
+                 "Kodi compiled 2024-04-05 by GCC 13.2.0 for Linux x86 64-bit version 6.1.0 (393472)",
+                 "Running on Ubuntu 24.04 LTS, kernel: Linux x86 64-bit version 6.8.0-31-generic", "FFmpeg version/source: 6.0.1-Kodi",
+                 f"Host CPU: AMD Ryzen 5 5600G with Radeon Graphics, {rnd.choice([6, 12])} cores available",
+                 "special://xbmc/ is mapped to: /usr/share/kodi", "special://xbmcbin/ is mapped to: /usr/lib/x86_64-linux-gnu/kodi",
+                 "special://masterprofile/ is mapped to: /home/kodi/.kodi/userdata", "special://home/ is mapped to: /home/kodi/.kodi",
+                 "special://temp/ is mapped to: /home/kodi/.kodi/temp", "The executable running is: /usr/lib/x86_64-linux-gnu/kodi/kodi.bin",
+                 "Local hostname: htpc", "Log File is located: /home/kodi/.kodi/temp/kodi.log", DASHES]
+        out = [h + line + "\n" for line in lines]
+        self.now += rnd.randint(200, 900)
+        out.append(self.header("info", THREADS[0]) + "Python interpreter version: 3.11.2 (main, Feb 16 2024, 12:00:00) [GCC 13.2.0]\n")
+        out.append(self.header("info", THREADS[0]) + "ADDON: xbmc.python v3.0.1 installed\n")
+        return out
+
+    def fill(self, template, addon):
+        rnd = self.rnd
+        return template.format(a=addon, v=f"{rnd.randint(1, 7)}.{rnd.randint(0, 20)}.{rnd.randint(0, 9)}", p=rnd.choice(PATHS), n=rnd.randint(1, 9999),
+                               u=f"https://api.example.com/{addon}/list.json?page={rnd.randint(1, 50)}", t=rnd.choice(THREADS),
+                               s=f"/home/kodi/.kodi/addons/{addon}/default.py")
+
+    def entry(self):
+        # One log entry: its header line plus any continuation lines
+        rnd = self.rnd; r = rnd.random(); error_rate, warning_rate, debug_rate = self.rates
+        level = "error" if r < error_rate else "warning" if r < error_rate + warning_rate else "debug" if r < error_rate + warning_rate + debug_rate else "info"
+        thread = rnd.choice(THREADS); addon = rnd.choice(ADDONS)
+        if level == "error" and rnd.random() < self.traceback_rate:
+            e, m = rnd.choice(EXCEPTIONS); s = f"/home/kodi/.kodi/addons/{addon}/resources/lib/main.py"
+            pad = " " * 48  # continuation lines are indented under the message, as Kodi writes them
+            return [self.header("error", thread) + TRACEBACK_HEAD + "\n"] + [pad + t.format(e=e, m=m, s=s, n=rnd.randint(5, 60), k=rnd.randint(61, 400)) + "\n" for t in TRACEBACK]
+        message = self.fill(rnd.choice(MESSAGES[level]), addon)
+        if "[" not in message and rnd.random() < 0.3: message = f"[{addon}] {message}"
+        return [self.header(level, thread, rnd.choice(COMPONENTS)) + message + "\n"]
+
+    def entries(self):
+        # Endless stream of lines, in chronological order, starting with a banner
+        rnd = self.rnd; last = None; next_banner = self.lines
+        while True:
+            if self.lines >= next_banner:
+                if last is not None: self.now += rnd.randint(5000, 600000); last = None  # Kodi restarted
+                for line in self.banner(): self.lines += 1; yield line
+                next_banner = self.lines + self.session_lines if self.session_lines else float("inf")
+            if last is not None and rnd.random() < self.repeat_rate:
+                lines = [self.stamp() + last[0][23:]] + last[1:]  # same message and thread, new time
+            else: lines = last = self.entry()
+            for line in lines: self.lines += 1; yield line
+            self.now += rnd.randint(0, 40)
+
+    def write(self, path, size, append=False, block=4 * 1024 * 1024):
+        # Writes about `size` bytes of whole lines; returns the bytes written
+        written = 0; entries = self.stream; buf = []; pending = 0
+        with open(path, "ab" if append else "wb") as f:
+            while written + pending < size:
+                line = next(entries).encode("utf-8"); buf.append(line); pending += len(line)
+                if pending >= block: f.write(b"".join(buf)); written += pending; buf = []; pending = 0
+            if buf: f.write(b"".join(buf)); written += pending
+        return written
+
+    def follow(self, path, rate, duration=None, stop=None, tick=0.05):
+        # Appends `rate` lines per second (flushed every tick, like Kodi) until duration or stop(); returns the lines written
+        entries = self.stream; sent = 0; start = time.perf_counter()
+        with open(path, "ab") as f:
+            while not (stop and stop()):
+                elapsed = time.perf_counter() - start
+                if duration is not None and elapsed >= duration: break
+                due = int(elapsed * rate) - sent
+                if due > 0: f.write(b"".join(next(entries).encode("utf-8") for _ in range(due))); f.flush(); sent += due
+                time.sleep(tick)
+        return sent
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="KodiLogGen", description="Write a synthetic Kodi log (reproducible for a given seed).")
+    p.add_argument("output", help="log file to write")
+    p.add_argument("-s", "--size", default="10MB", help="size to write, e.g. 250KB, 100MB, 1GB (default 10MB)")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--errors", type=float, default=0.02, help="share of entries logged as ERROR")
+    p.add_argument("--warnings", type=float, default=0.05, help="share of entries logged as WARNING")
+    p.add_argument("--debug", type=float, default=0.4, help="share of entries logged as DEBUG")
+    p.add_argument("--tracebacks", type=float, default=0.25, help="share of errors followed by a Python traceback")
+    p.add_argument("--repeats", type=float, default=0.05, help="chance that a message is repeated right away")
+    p.add_argument("--session-lines", type=int, default=0, help="start a new Kodi session (banner) every N lines")
+    p.add_argument("-a", "--append", action="store_true", help="append to the file instead of replacing it")
+    p.add_argument("-r", "--rate", type=float, default=0, help="after writing, keep appending this many lines per second (Ctrl+C to stop)")
+    p.add_argument("-d", "--duration", type=float, help="stop appending after this many seconds")
+    args = p.parse_args(argv)
+    try: size = parse_size(args.size)
+    except ValueError as e: p.error(str(e))
+    gen = KodiLogGenerator(args.seed, args.errors, args.warnings, args.debug, args.tracebacks, args.repeats, args.session_lines)
+    try:
+        written = gen.write(args.output, size, args.append) if size else 0
+        print(f"KodiLogGen: wrote {written:,} bytes ({gen.lines:,} lines) to {args.output}", file=sys.stderr)
+        if args.rate > 0:
+            sent = gen.follow(args.output, args.rate, args.duration)
+            print(f"KodiLogGen: appended {sent:,} lines", file=sys.stderr)
+    except KeyboardInterrupt: return 130
+    except OSError as e:
+        print(f"KodiLogGen: {e}", file=sys.stderr); return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
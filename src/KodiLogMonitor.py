@@ -1,20 +1,46 @@
 import ctypes
 import tkinter as tk
-from tkinter import filedialog, scrolledtext, messagebox, ttk
+from tkinter import filedialog, scrolledtext, messagebox, ttk, font as tkfont
 import threading
 import os
-import time
-import re
 import sys
+import json
 import locale
+import re
 import subprocess
+import time
+from array import array
+from bisect import bisect_left
 from collections import deque
+from itertools import takewhile
+from KodiLogEngine import get_keyword_matcher, clear_keyword_cache, file_identity, make_watcher, LogStats, LogFilter, LineStore, LineIndex, LineQueue, LogTailer, SessionIndex, RepeatFilter, IndexCache, PerfCounters, SamplingProfiler, LEVEL_TAGS, parse_line, format_time, iter_file_lines, filter_lines, export_lines
 
 # --- CONFIGURATION ---
 APP_VERSION = "v1.2.1" 
 CONFIG_FILE = ".kodi_monitor_config"
 ICON_NAME = "logo.ico"
 KEYWORD_DIR = "keyword_lists"
+GUI_REFRESH_MS = 50              # interval at which queued log lines are drawn
+QUEUE_MAX_LINES = 5000           # pending lines before the backpressure policy applies
+QUEUE_POLICY = "summarize"       # "block", "drop_oldest" or "summarize" (drop + "N lines skipped")
+QUEUE_BATCH_LINES = 2000         # max lines drawn per refresh
+VIEW_MARGIN = 5                  # extra lines rendered below the viewport in ∞ mode
+WATCHER_BACKEND = "auto"         # "auto" (inotify on Linux, else polling), "inotify" or "polling"
+TAIL_WAIT_TIMEOUT = 1.0          # max seconds the tail thread sleeps between checks when the watcher stays silent
+REPEAT_WINDOW_LINES = 150        # distinct recent messages remembered for collapsing repeats
+REPEAT_WINDOW_SECONDS = 10.0     # a message repeated within this many seconds (log time) only bumps its "×N" counter
+VIEW_MAX_LINES = 20000           # lines kept in the live view; older lines are evicted in batches
+VIEW_TRIM_LINES = 2000           # eviction batch: the view may exceed VIEW_MAX_LINES by this much before trimming
+STORE_MAX_LINES = 200000         # log lines kept in memory for refiltering
+SEARCH_DEBOUNCE_MS = 200         # typing pause before the search is applied
+INDEX_CACHE_DIR = ".kodi_monitor_cache"  # ∞ mode line indexes saved per log, so reopening only indexes the new tail
+INDEX_CACHE_MB = 256             # size limit of the index cache, least recently used logs go first (0 = off)
+INDEX_CACHE_SAVE_SECONDS = 30    # while tailing, a grown index is saved again at most this often
+FILTER_EXTEND_MS = 50            # longest the ∞ filter scans newly tailed lines on the GUI thread before the worker takes over
+PERF_PANEL = False               # show the ⏱ performance panel (stage timings, backlog, throughput) at startup
+PERF_PANEL_MS = 1000             # refresh interval of the performance panel
+EXPORT_STATUS_MS = 5000          # how long the result of an export stays in the footer
+PROFILE_INTERVAL_MS = 5          # stack sampling interval of a ⏺ profiling session
 
 # --- DPI AWARENESS on Windows ---
 try:
@@ -38,6 +64,7 @@ LOG_COLORS = {
     "warning": "#FF9800",        
     "error": "#F44336",          
     "summary": "#00E5FF",        
+    "repeat": "#90A4AE",         
     "highlight_bg": "#FFF176",   
     "highlight_fg": "#000000"    
 }
@@ -50,34 +77,160 @@ LANGS = {
         "log": "📂  LOG", "sum": "📝  RÉSUMÉ", "exp": "💾  EXPORT", "clr": "🗑️  VIDER", "all": "TOUT", "info": "INFO", "warn": "WARNING", "err": "ERROR",
         "ready": "Prêt", "sel": "Sélectionnez un log.", "sys_sum": "\n--- RÉSUMÉ SYSTÈME ---\n", "loading": "Chargement...", "reset": "\n--- FICHIER RÉINITIALISÉ PAR KODI ---\n",
         "stats": " | 📈 {}{} : {} / {} lignes | 📁 {}", "stats_simple": " | 📈 TOTAL : {} lignes | 📁 {}", "limit": " | ⚠️ LIMITÉ AUX 1000 DERNIÈRES LIGNES", "none": "Aucun",
-        "paused": "⏸️ EN PAUSE"
+        "paused": "⏸️ EN PAUSE", "skipped": "\n--- {} LIGNES IGNORÉES ---\n", "repeat": "  ×{}, dernier à {}"
     },
     "EN": {
         "log": "📂  LOG", "sum": "📝  SUMMARY", "exp": "💾  EXPORT", "clr": "CLEAR", "all": "ALL", "info": "INFO", "warn": "WARNING", "err": "ERROR",
         "ready": "Ready", "sel": "Select a log.", "sys_sum": "\n--- SYSTEM SUMMARY ---\n", "loading": "Loading...", "reset": "\n--- FILE RESET BY KODI ---\n",
         "stats": " | 📈 {}{} : {} / {} lines | 📁 {}", "stats_simple": " | 📈 TOTAL : {} lines | 📁 {}", "limit": " | ⚠️ LIMITED TO LAST 1000 LINES", "none": "None",
-        "paused": "⏸️ PAUSED"
+        "paused": "⏸️ PAUSED", "skipped": "\n--- {} LINES SKIPPED ---\n", "repeat": "  ×{}, last at {}"
     },
     "ES": {
         "log": "📂  LOG", "sum": "📝  RESUMEN", "exp": "💾  EXPORTAR", "clr": "LIMPIAR", "all": "TODO", "info": "INFO", "warn": "AVISO", "err": "ERROR",
         "ready": "Listo", "sel": "Seleccione un log.", "sys_sum": "\n--- RESUMEN DEL SISTEMA ---\n", "loading": "Cargando...", "reset": "\n--- ARCHIVO REINICIADO POR KODI ---\n",
         "stats": " | 📈 {}{} : {} / {} líneas | 📁 {}", "stats_simple": " | 📈 TOTAL : {} líneas | 📁 {}", "limit": " | ⚠️ LIMITADO A LAS ULTIMAS 1000 LÍNEAS", "none": "Ninguno",
-        "paused": "⏸️ EN PAUSA"
+        "paused": "⏸️ EN PAUSA", "skipped": "\n--- {} LÍNEAS OMITIDAS ---\n", "repeat": "  ×{}, último a las {}"
     },
     "DE": {
         "log": "📂  LOG", "sum": "📝  REZUMAT", "exp": "💾  EXPORT", "clr": "LEEREN", "all": "ALLES", "info": "INFO", "warn": "WARNUNG", "err": "FEHLER",
         "ready": "Bereit", "sel": "Log auswählen.", "sys_sum": "\n--- SYSTEMZUSAMMENFASSUNG ---\n", "loading": "Laden...", "reset": "\n--- DATEI VON KODI ZURÜCKGESETZT ---\n",
         "stats": " | 📈 {}{} : {} / {} Zeilen | 📁 {}", "stats_simple": " | 📈 GESAMT : {} Zeilen | 📁 {}", "limit": " | ⚠️ BEGRENZT AUF DIE LETZTEN 1000 ZEILEN", "none": "Keiner",
-        "paused": "⏸️ PAUSE"
+        "paused": "⏸️ PAUSE", "skipped": "\n--- {} ZEILEN ÜBERSPRUNGEN ---\n", "repeat": "  ×{}, zuletzt um {}"
     },
     "IT": {
         "log": "📂  LOG", "sum": "📝  SOMMARIO", "exp": "💾  ESPORTA", "clr": "PULISCI", "all": "TUTTO", "info": "INFO", "warn": "AVVISO", "err": "ERRORE",
         "ready": "Pronto", "sel": "Seleziona un log.", "sys_sum": "\n--- SOMMARIO DI SISTEMA ---\n", "loading": "Caricamento...", "reset": "\n--- FILE REINIZIALIZZATO DA KODI ---\n",
         "stats": " | 📈 {}{} : {} / {} righe | 📁 {}", "stats_simple": " | 📈 TOTALE : {} righe | 📁 {}", "limit": " | ⚠️ LIMITATO ALLE ULTIME 1000 RIGHE", "none": "Nessuno",
-        "paused": "⏸️ IN PAUSA"
+        "paused": "⏸️ IN PAUSA", "skipped": "\n--- {} RIGHE SALTATE ---\n", "repeat": "  ×{}, ultimo alle {}"
     }
 }
 
+# --- VIRTUAL VIEW (∞ mode) ---
+# Shows a memory-mapped LineIndex through the Text widget without loading the file into it:
+# only the lines in the viewport are inserted, and the scrollbar, mouse wheel and keys move
+# a line cursor over the (optionally filtered) index instead of scrolling the widget.
+class VirtualLogView:
+    def __init__(self, app):
+        self.app = app; self.txt = app.txt_area
+        self.active = False; self.index = None
+        self.lines = None; self.base = 0; self.top = 0
+        self.filtered_upto = 0; self.filter_job = 0; self.pending = False; self.deferred_jump = None
+        self.lines_filter = None; self.filter_request = None; self.filter_thread = None; self.filter_cond = threading.Condition()
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"): self.txt.bind(seq, self.on_wheel, add="+")
+        for seq in ("<Prior>", "<Next>", "<Up>", "<Down>", "<Control-Home>", "<Control-End>"): self.txt.bind(seq, self.on_key, add="+")
+        self.txt.bind("<Configure>", lambda e: self.render(), add="+")
+
+    def activate(self, index):
+        self.deactivate()
+        self.index = index; self.active = True
+        self.txt.config(yscrollcommand=lambda *a: None); self.txt.vbar.config(command=self.on_scrollbar)
+
+    def deactivate(self):
+        if self.index: self.index.close()
+        self.active = False; self.index = None; self.lines = self.lines_filter = None; self.base = self.top = self.filtered_upto = 0
+        self.filter_job += 1; self.pending = False; self.deferred_jump = None
+        self.txt.config(yscrollcommand=self.txt.vbar.set); self.txt.vbar.config(command=self.txt.yview)
+
+    def count(self): return len(self.lines) if self.lines is not None else self.filtered_upto - self.base
+    def line_no(self, k): return self.lines[k] if self.lines is not None else self.base + k
+
+    def rows(self):
+        line_h = tkfont.Font(font=self.txt.cget("font")).metrics("linespace")
+        return max(1, self.txt.winfo_height() // max(1, line_h))
+
+    def render(self, follow=False):
+        if not self.active: return
+        n = self.count(); rows = self.rows(); idx = self.index; matcher = self.app.line_filter.matcher
+        if follow: self.top = n - rows
+        self.top = max(0, min(self.top, n - rows))
+        perf = self.app.perf; t = time.perf_counter() if perf.enabled else None
+        segs = []
+        for k in range(self.top, min(n, self.top + rows + VIEW_MARGIN)):
+            i = self.line_no(k); text = idx.line(i)
+            segs += self.app.highlight_segments(text, idx.tag(i), matcher.spans(text) if matcher else [])
+        if t is not None: t2 = time.perf_counter(); perf.add("highlight", t2 - t); t = t2
+        self.txt.config(state=tk.NORMAL); self.txt.delete('1.0', tk.END)
+        if segs: self.txt.insert(tk.END, *segs)
+        if t is not None: perf.add("insert", time.perf_counter() - t)
+        self.txt.vbar.set(*((self.top / n, min(1.0, (self.top + rows) / n)) if n else (0.0, 1.0)))
+
+    def apply_filter(self, flt):
+        # When only the search text grew, the last finished result is refined (new lines are added by extend)
+        self.filter_job += 1; job = self.filter_job; idx = self.index; base = self.base; end = idx.count
+        if flt.passes_all():
+            self.lines = None; self.lines_filter = flt; self.filtered_upto = end; self.pending = False; self.app.show_loading(False)
+            self.render(follow=not self.app.is_paused.get()); self.app.update_stats(); return
+        within = None
+        if self.lines is not None and flt.narrows(self.lines_filter): within = self.lines[:]; end = self.filtered_upto
+        self.pending = True; self.app.show_loading(True)
+        self.request_scan(job, flt, base, end, within)
+
+    def request_scan(self, job, flt, start, end, within=None, append=False):
+        # append: the result extends the current lines instead of replacing them
+        with self.filter_cond: self.filter_request = (job, self.index, flt, start, end, within, append); self.filter_cond.notify()
+        if self.filter_thread is None: self.filter_thread = threading.Thread(target=self.filter_worker, daemon=True); self.filter_thread.start()
+
+    def filter_worker(self):
+        # The only thread scanning the index for filters: requests replace each other instead of stacking up
+        while True:
+            with self.filter_cond:
+                while self.filter_request is None: self.filter_cond.wait()
+                job, idx, flt, base, end, within, append = self.filter_request; self.filter_request = None
+            if job != self.filter_job: continue
+            try: lines = idx.select(flt, base, end, cancel=lambda: job != self.filter_job, within=within)
+            except: continue  # the index was closed under the scan
+            if job == self.filter_job: self.app.post(self.set_lines, job, lines, end, flt, append)
+
+    def set_lines(self, job, lines, end, flt, append=False):
+        if job != self.filter_job or not self.active: return
+        if append: self.lines.extend(lines)
+        else: self.lines = lines; self.lines_filter = flt
+        self.filtered_upto = end; self.pending = False
+        self.app.show_loading(False); self.extend(self.index.count)
+        if self.deferred_jump is not None: self.jump_to(self.deferred_jump)
+
+    def extend(self, end):
+        # New lines were indexed by the tail thread
+        if not self.active or self.pending: return
+        if self.lines is not None and end > self.filtered_upto:
+            perf = self.app.perf; t = time.perf_counter() if perf.enabled else None
+            flt = self.app.line_filter; deadline = time.perf_counter() + FILTER_EXTEND_MS / 1000
+            lines = self.index.select(flt, self.filtered_upto, end, cancel=lambda: time.perf_counter() > deadline)
+            if t is not None: perf.add("filter", time.perf_counter() - t)
+            if time.perf_counter() > deadline:  # a big tail (or a slow regex): the worker scans it, the view stays usable
+                self.filter_job += 1; self.pending = True
+                self.request_scan(self.filter_job, flt, self.filtered_upto, end, append=True); return
+            self.lines.extend(lines)
+        self.filtered_upto = max(self.filtered_upto, end)
+        self.render(follow=not self.app.is_paused.get()); self.app.update_stats()
+
+    def clear(self):
+        self.base = self.filtered_upto
+        if self.lines is not None: self.lines = self.lines[:0]
+        self.render()
+
+    def jump_to(self, line_no):
+        if self.pending: self.deferred_jump = line_no; return  # applied once the filter is ready
+        self.deferred_jump = None
+        self.top = bisect_left(self.lines, line_no) if self.lines is not None else line_no - self.base
+        self.render()
+
+    def scroll(self, delta): self.top += delta; self.render()
+
+    def on_scrollbar(self, *args):
+        if args[0] == "moveto": self.top = int(float(args[1]) * self.count()); self.render()
+        elif args[0] == "scroll": self.scroll(int(args[1]) * (self.rows() if args[2] == "pages" else 1))
+
+    def on_wheel(self, event):
+        if not self.active: return
+        self.scroll(-3 if event.num == 4 or (event.delta or 0) > 0 else 3); return "break"
+
+    def on_key(self, event):
+        if not self.active: return
+        rows = self.rows()
+        moves = {"Prior": -rows, "Next": rows, "Up": -1, "Down": 1, "Home": -self.count(), "End": self.count()}
+        self.scroll(moves.get(event.keysym, 0)); return "break"
+
 class KodiLogMonitor:
     def __init__(self, root):
         self.root = root
@@ -89,7 +242,28 @@ class KodiLogMonitor:
         self.log_file_path = ""
         self.running = False
         self.monitor_thread = None
-        self.seen_lines = deque(maxlen=150) 
+        self.repeats = RepeatFilter(REPEAT_WINDOW_LINES, REPEAT_WINDOW_SECONDS)
+        self.view_base = 0
+        self.backfill_job = 0
+        self.index_cache = IndexCache(INDEX_CACHE_DIR, INDEX_CACHE_MB * 1024 * 1024) if INDEX_CACHE_MB else None
+        self.perf = PerfCounters(PERF_PANEL)
+        self.after_pending = 0
+        self.perf_job = None
+        self.profiler = None
+        self.export_cancel = None  # threading.Event of the running export
+        self.export_span = ""  # footer label of the exported time range, if any
+        self.closing = False  # set once the window is closed (running is also off while a log is reopened)
+        self.kw_matcher = None
+        self.stats = LogStats()
+        self.store = LineStore()
+        self.sessions = None
+        self.pending_jump = None
+        self.line_filter = LogFilter()
+        self.matched = None
+        self.search_job = None
+        self.line_queue = LineQueue(QUEUE_MAX_LINES, QUEUE_POLICY)
+        self.shown_size = 0
+        self.shown_upto = 0
         
         self.load_full_file = tk.BooleanVar(value=False)
         self.wrap_mode = tk.BooleanVar(value=False)
@@ -97,96 +271,327 @@ class KodiLogMonitor:
         self.current_lang = tk.StringVar(value=self.detect_os_language())
         self.current_filter_tag = tk.StringVar(value="all")
         self.search_query = tk.StringVar()
+        self.search_regex = tk.BooleanVar(value=False)
+        self.perf_panel = tk.BooleanVar(value=PERF_PANEL)
+        self.profiling = tk.BooleanVar(value=False)
         self.selected_list = tk.StringVar()
         self.font_size = 10
         
         self.filter_colors = {"all": COLOR_ACCENT, "info": LOG_COLORS["info"], "warning": LOG_COLORS["warning"], "error": LOG_COLORS["error"]}
         
         self.setup_ui()
+        self.view = VirtualLogView(self)
         self.load_session()
         self.root.geometry(self.window_geometry)
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
         self.current_filter_tag.trace_add("write", self.trigger_refresh)
         self.search_query.trace_add("write", self.on_search_change)
+        self.root.after(GUI_REFRESH_MS, self.drain_queue)
+        if PERF_PANEL: self.toggle_perf()
 
     def on_closing(self):
-        self.running = False
+        self.running = False; self.closing = True
+        if self.profiler: self.profiler.stop()
+        if self.export_cancel: self.export_cancel.set()
         self.window_geometry = self.root.geometry()
         self.save_session()
         self.root.destroy()
 
-    def is_duplicate(self, text):
-        clean_text = text.strip()
-        if not clean_text: return False
-        if clean_text in self.seen_lines: return True
-        self.seen_lines.append(clean_text)
-        return False
+    def collapse(self, items, bumped):
+        # (store index, spans) -> lines to insert; a repeat only adds its shown entry to `bumped`
+        store = self.store; out = []
+        for i, spans in items:
+            text = store.text(i); entry, shown = self.repeats.add(text, store.head(i))
+            if shown: out.append((text, store.tag(i), spans, entry))
+            else: bumped.add(entry)
+        return out
+
+    def update_repeats(self, entries):
+        # Rewrites the "×N, last at HH:MM:SS" counter at the end of each entry's line: one edit per entry per batch
+        if self.repeats.expired: self.txt_area.mark_unset(*self.repeats.expired); self.repeats.expired.clear()
+        fmt = LANGS.get(self.current_lang.get(), LANGS["EN"])["repeat"]
+        for e in entries:
+            if e.line is None or e.line <= self.view_base: continue
+            if e.mark is None:
+                e.mark = f"repeat{id(e)}"; self.txt_area.mark_set(e.mark, f"{e.line - self.view_base}.0 lineend"); self.txt_area.mark_gravity(e.mark, tk.LEFT)
+            else: self.txt_area.delete(e.mark, f"{e.mark} lineend")
+            self.txt_area.insert(e.mark, fmt.format(e.count, e.last_clock()), "repeat")
+
+    def reset_repeats(self):
+        marks = [e.mark for e in self.repeats.entries.values() if e.mark] + self.repeats.expired
+        if marks: self.txt_area.mark_unset(*marks)
+        self.repeats.clear()
+
+    def reset_view(self):
+        # The view is emptied: line numbering and repeat counters start over
+        self.txt_area.config(state=tk.NORMAL); self.txt_area.delete('1.0', tk.END)
+        self.reset_repeats(); self.view_base = 0; self.backfill_job += 1
+
+    def trim_view(self, incoming=0):
+        # Keeps the live view at VIEW_MAX_LINES: once VIEW_TRIM_LINES extra lines would pile up, the oldest go
+        # in one delete (export reads the file, not the view). Runs before a batch is collapsed,
+        # so repeats of an evicted entry start a new visible one instead of bumping a counter nobody sees
+        lines = int(self.txt_area.index("end-1c").split(".")[0]) - 1
+        if lines + incoming <= VIEW_MAX_LINES + VIEW_TRIM_LINES: return
+        n = min(lines, lines + incoming - VIEW_MAX_LINES)
+        self.txt_area.delete("1.0", f"{n + 1}.0"); self.view_base += n
+        self.repeats.drop_before(self.view_base)
+
+    def update_sessions(self, sessions, upto):
+        try: sessions.update(upto)
+        except OSError: pass  # log renamed away mid-rotation; the tail thread restarts the monitor
+
+    # --- PERFORMANCE ---
+    def post(self, fn, *args):
+        # root.after(0) for the worker threads; while the counters run, pending callbacks are counted (the backlog)
+        if not self.perf.enabled: self.root.after(0, fn, *args); return
+        with self.perf.lock: self.after_pending += 1
+        self.root.after(0, self.run_posted, fn, args)
+
+    def run_posted(self, fn, args):
+        with self.perf.lock: self.after_pending = max(0, self.after_pending - 1)
+        fn(*args)
+
+    def toggle_perf(self):
+        # The counters run while the ⏱ panel is shown or a ⏺ profiling session records
+        was = self.perf.enabled
+        self.perf.enabled = self.perf_panel.get() or self.profiling.get()
+        if self.perf.enabled and not was: self.perf.reset(); self.after_pending = 0
+        if self.perf_panel.get():
+            self.perf_label.pack(side=tk.LEFT, padx=(10, 0))
+            if self.perf_job is None: self.update_perf_panel()
+        else: self.perf_label.pack_forget(); self.perf_var.set("")
+
+    def update_perf_panel(self):
+        self.perf_job = None
+        if not self.perf_panel.get(): return
+        ms, lines, nbytes = self.perf.rates()
+        stages = "  ".join(f"{name} {ms[stage]:.0f}" for stage, name in (("read", "rd"), ("parse", "parse"), ("filter", "flt"), ("highlight", "hl"), ("insert", "ins"), ("stats", "st")))
+        self.perf_var.set(f"⏱ {stages} ms/s | after {self.after_pending} · queue {len(self.line_queue)} | {lines:,.0f} lines/s · {nbytes / 1024:,.0f} KB/s")
+        self.perf_job = self.root.after(PERF_PANEL_MS, self.update_perf_panel)
+
+    def toggle_profiling(self):
+        # ⏺ starts a session (counters reset + stack sampling); pressing it again saves both to a JSON file for a bug report
+        if self.profiling.get():
+            self.toggle_perf(); self.perf.reset(); self.after_pending = 0
+            self.profiler = SamplingProfiler(PROFILE_INTERVAL_MS / 1000); self.profiler.start(); return
+        report = {"app": f"Kodi Log Monitor {APP_VERSION}", "python": sys.version.split()[0], "platform": sys.platform, "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+                  "log": {"size": self.stats.size, "lines": self.stats.total_lines, "mode": "full" if self.view.active else "tail"},
+                  "filter": {"level": self.current_filter_tag.get(), "search": bool(self.search_query.get()), "regex": self.search_regex.get(), "list": self.kw_matcher is not None},
+                  "settings": {"GUI_REFRESH_MS": GUI_REFRESH_MS, "QUEUE_MAX_LINES": QUEUE_MAX_LINES, "QUEUE_POLICY": QUEUE_POLICY, "QUEUE_BATCH_LINES": QUEUE_BATCH_LINES,
+                               "VIEW_MAX_LINES": VIEW_MAX_LINES, "STORE_MAX_LINES": STORE_MAX_LINES, "WATCHER_BACKEND": WATCHER_BACKEND},
+                  "backlog": {"after": self.after_pending, "queue": len(self.line_queue)},
+                  "counters": self.perf.snapshot(), "profile": self.profiler.stop() if self.profiler else None}
+        self.profiler = None; self.toggle_perf()
+        p = filedialog.asksaveasfilename(defaultextension=".json", initialfile="kodi_monitor_profile.json", filetypes=[("JSON", "*.json")])
+        if p:
+            with open(p, "w", encoding="utf-8") as f: json.dump(report, f, indent=1, ensure_ascii=False)
 
-    def monitor_loop(self):
+    def monitor_loop(self, q, store, stats, sessions):
         try:
-            with open(self.log_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                if self.load_full_file.get(): f.seek(0)
-                else:
-                    f.seek(0, os.SEEK_END)
-                    f.seek(max(0, f.tell() - 250000))
-                
-                initial_lines = f.readlines()
-                if not self.load_full_file.get(): initial_lines = initial_lines[-1000:]
-                last_pos = f.tell()
-                
-                to_display = []
-                for line in initial_lines:
-                    data = self.get_line_data(line)
-                    if data and not self.is_duplicate(data[0]): to_display.append(data)
-                self.root.after(0, self.bulk_insert, to_display)
-
-                while self.running:
-                    if not os.path.exists(self.log_file_path): break
-                    current_size = os.path.getsize(self.log_file_path)
-                    if current_size < last_pos:
-                        self.root.after(0, self.start_monitoring, self.log_file_path, False, False)
-                        return 
-
-                    line = f.readline()
-                    if not line:
-                        self.root.after(0, self.update_stats)
-                        time.sleep(0.4)
+            tailer = LogTailer(self.log_file_path, max(0, os.path.getsize(self.log_file_path) - 250000), WATCHER_BACKEND)
+            try:
+                stats.resync(self.log_file_path, tailer.pos)
+                initial_lines = tailer.read_lines()
+                for off, line in initial_lines: stats.feed(line)
+                for off, line in initial_lines[-1000:]: store.append(line, off)
+                stats.feed("", tailer.pos); del initial_lines
+                self.update_sessions(sessions, tailer.pos)
+                self.post(self.on_initial_load, q)
+
+                perf = self.perf
+                while self.running and q is self.line_queue:
+                    t = time.perf_counter() if perf.enabled else None; pos = tailer.pos
+                    lines = tailer.read_lines()
+                    if t is not None: perf.add("read", time.perf_counter() - t, len(lines), tailer.pos - pos)
+                    if not lines:
+                        if tailer.changed() == "replaced":
+                            self.post(self.start_monitoring, self.log_file_path, False, False)
+                            return
+                        if self.kw_matcher: self.kw_matcher.refresh()
+                        tailer.wait(TAIL_WAIT_TIMEOUT)
                         continue
 
-                    last_pos = f.tell()
-                    data = self.get_line_data(line)
-                    if data and not self.is_duplicate(data[0]):
-                        self.root.after(0, self.append_to_gui, data[0], data[1])
+                    t = time.perf_counter() if perf.enabled else None
+                    idxs = [store.append(line, off) for off, line in lines]
+                    if t is not None: perf.add("parse", time.perf_counter() - t)
+                    for (off, line), idx in zip(lines, idxs):
+                        stats.feed(line)
+                        while not q.put(idx, timeout=0.2):
+                            if not self.running or q is not self.line_queue: return
+                    stats.feed("", tailer.pos); self.update_sessions(sessions, tailer.pos)
+            finally: tailer.close()
         except:
-            self.root.after(0, self.show_loading, False)
+            self.post(self.show_loading, False)
 
-    def bulk_insert(self, data_list):
-        if not self.running: return
-        self.txt_area.config(state=tk.NORMAL)
-        for text, tag in data_list: self.insert_with_highlight(text, tag)
+    def index_loop(self, q, index, stats, sessions):
+        # ∞ mode: the file is indexed (not loaded) in the background, then the index is extended as Kodi writes.
+        # A cached index of the same file is loaded first, so only what was appended since is indexed
+        try:
+            last_pct = [-1]; cache = self.index_cache; saved = [None, 0.0]
+            def progress(pos, size):
+                pct = pos * 100 // max(1, size)
+                if pct != last_pct[0]: last_pct[0] = pct; self.post(self.show_progress, q, pct)
+            def save_index():
+                state = (index.count, len(index.levels))
+                if cache and state != saved[0] and cache.save(index, sessions): saved[0] = state
+                saved[1] = time.monotonic()
+            ident = file_identity(self.log_file_path); perf = self.perf
+            if cache and cache.load(index, sessions): saved[0] = (index.count, len(index.levels))
+            t = time.perf_counter() if perf.enabled else None; count, end = index.count, index.end
+            index.update(progress, cancel=lambda: not self.running or q is not self.line_queue)
+            if t is not None: perf.add("read", time.perf_counter() - t, index.count - count, index.end - end)
+            stats.lines = index.count; stats.size = index.end
+            self.update_sessions(sessions, index.end)
+            self.post(self.on_initial_load, q)
+            save_index()
+
+            watcher = make_watcher(self.log_file_path, WATCHER_BACKEND)
+            try:
+                while self.running and q is self.line_queue:
+                    watcher.wait(TAIL_WAIT_TIMEOUT)
+                    try: st = os.stat(self.log_file_path)
+                    except OSError: continue  # renamed away by Kodi, the new log is not created yet
+                    if st.st_size == index.end:
+                        if self.kw_matcher: self.kw_matcher.refresh()
+                        if time.monotonic() - saved[1] > INDEX_CACHE_SAVE_SECONDS: save_index()  # also keeps levels parsed by filters since
+                        continue
+                    t = time.perf_counter() if perf.enabled else None; count, end = index.count, index.end
+                    if (st.st_dev, st.st_ino) != ident or not index.update():
+                        self.post(self.start_monitoring, self.log_file_path, False, False)
+                        return
+                    if t is not None: perf.add("read", time.perf_counter() - t, index.count - count, index.end - end)
+                    stats.lines = index.count; stats.size = index.end; self.update_sessions(sessions, index.end)
+                    while not q.put(index.count, timeout=0.2):
+                        if not self.running or q is not self.line_queue: return
+            finally: watcher.close()
+        except:
+            self.post(self.show_loading, False)
+
+    def on_initial_load(self, q):
+        if not self.running or q is not self.line_queue: return
+        self.show_loading(False); self.refilter()
+        if self.pending_jump is not None and self.view.active: self.jump_to_offset(self.pending_jump)
+        self.pending_jump = None
+
+    def show_progress(self, q, pct):
+        if q is self.line_queue: self.loading_label.config(text=f"{LANGS.get(self.current_lang.get(), LANGS['EN'])['loading']} {pct}%")
+
+    def refilter(self):
+        # Re-applies the current filters to the lines already in memory; the tail thread keeps running.
+        # When only the search text grew, just the lines matched so far (self.matched) are checked again
+        try: flt = self.build_filter()
+        except re.error: self.search_entry.config(fg=COLOR_DANGER); return  # incomplete pattern: the last results stay
+        self.search_entry.config(fg="white")
+        prev, self.line_filter = self.line_filter, flt
+        if self.view.active: self.matched = None; self.reset_repeats(); self.view.apply_filter(flt); return
+        within = self.matched if self.matched is not None and flt.narrows(prev) else None
+        self.reset_view()
+        end = self.shown_upto = len(self.store); bumped = set()
+        t = time.perf_counter() if self.perf.enabled else None
+        selected = list(self.store.select(flt, 0, end, within))
+        if t is not None: self.perf.add("filter", time.perf_counter() - t)
+        self.matched = array("l", (i for i, spans in selected)) if flt.query else None
+        items = self.collapse(selected, bumped)
+        if len(items) > VIEW_MAX_LINES:  # only the newest VIEW_MAX_LINES are shown
+            old, items = items[:-VIEW_MAX_LINES], items[-VIEW_MAX_LINES:]
+            for text, tag, spans, entry in old:
+                if entry is not None and entry.line is None: entry.line = 0
+            self.repeats.drop_before(0)
+        self.bulk_insert(items)
+        self.update_repeats(bumped)
+        room = VIEW_MAX_LINES - len(items)
+        if self.store.base and room > 0:  # lines evicted from the store are read back from the file
+            store = self.store; self.backfill_job += 1
+            threading.Thread(target=self.backfill_worker, args=(self.backfill_job, self.log_file_path, store.first_offset, store.offset(store.base), flt, room), daemon=True).start()
+
+    def backfill_worker(self, job, path, start, end, flt, room):
+        # Filters the log between start and end (the store's evicted lines) like the store and keeps the
+        # newest `room` shown entries; repeats are collapsed among these lines only
+        repeats = RepeatFilter(REPEAT_WINDOW_LINES, REPEAT_WINDOW_SECONDS); items = deque(maxlen=room)
+        lines = takewhile(lambda line: line[0] < end and job == self.backfill_job, iter_file_lines(path, start=start))
+        try:
+            for n, rec, spans in filter_lines(lines, flt):
+                entry, shown = repeats.add(rec.text, (rec.parent or rec).offset)
+                if shown: items.append((rec.text, LEVEL_TAGS[rec.level], spans, entry))
+        except OSError: return
+        if job == self.backfill_job and items and not self.closing: self.post(self.insert_backfill, job, list(items))
+
+    def insert_backfill(self, job, items):
+        # Backfilled lines go above the view; their repeat counters are final, so they are written as plain text
+        if job != self.backfill_job: return
+        fmt = LANGS.get(self.current_lang.get(), LANGS["EN"])["repeat"]; args = []; counted = set()
+        for text, tag, spans, entry in items:
+            segs = self.highlight_segments(text, tag, spans)
+            if entry is not None and entry.count > 1 and entry not in counted: counted.add(entry); segs[-2] = segs[-2].rstrip("\n"); segs += [fmt.format(entry.count, entry.last_clock()), "repeat", "\n", tag or ""]
+            args += segs
+        self.txt_area.config(state=tk.NORMAL); self.txt_area.insert("1.0", *args); self.view_base -= len(items)
         if not self.is_paused.get(): self.txt_area.see(tk.END)
-        self.update_stats(); self.show_loading(False)
+        self.update_stats()
 
-    def append_to_gui(self, text, tag):
-        if not self.running: return
+    def build_filter(self):
+        self.kw_matcher = self.load_keyword_matcher()
+        return LogFilter(self.current_filter_tag.get(), self.search_query.get(), self.kw_matcher, regex=self.search_regex.get())
+
+    def bulk_insert(self, data_list):
         self.txt_area.config(state=tk.NORMAL)
-        self.insert_with_highlight(text, tag)
+        for i in range(0, len(data_list), QUEUE_BATCH_LINES): self.insert_batch(data_list[i:i + QUEUE_BATCH_LINES])
         if not self.is_paused.get(): self.txt_area.see(tk.END)
         self.update_stats()
 
+    def drain_queue(self):
+        try:
+            batch, skipped = self.line_queue.drain(QUEUE_BATCH_LINES)
+            if self.running and self.view.active:
+                if batch: self.view.extend(max(batch))
+            elif self.running and (batch or skipped):
+                store, flt = self.store, self.line_filter; bumped = set()
+                perf = self.perf; t = time.perf_counter() if perf.enabled else None
+                matches = [(i, spans) for i, spans in ((i, store.match(flt, i)) for i in batch if i >= max(self.shown_upto, store.base)) if spans is not None]
+                if t is not None: perf.add("filter", time.perf_counter() - t)
+                self.txt_area.config(state=tk.NORMAL); self.trim_view(len(matches))  # only the lines that will be shown count
+                if skipped: self.matched = None  # dropped lines are in the store but not in the match set
+                elif self.matched is not None: self.matched.extend(i for i, spans in matches)
+                to_display = self.collapse(matches, bumped)
+                if skipped: self.txt_area.insert(tk.END, LANGS.get(self.current_lang.get(), LANGS["EN"])["skipped"].format(skipped), "warning")
+                self.insert_batch(to_display); self.update_repeats(bumped)
+                if len(store.texts) > STORE_MAX_LINES + VIEW_TRIM_LINES:
+                    store.trim(STORE_MAX_LINES)
+                    if self.matched is not None: del self.matched[:bisect_left(self.matched, store.base)]
+                if not self.is_paused.get(): self.txt_area.see(tk.END)
+                self.update_stats()
+            elif self.running and self.stats.size != self.shown_size: self.update_stats()
+        finally: self.root.after(GUI_REFRESH_MS, self.drain_queue)
+
+    def insert_batch(self, batch):
+        # One Text.insert call for the whole batch: Tk accepts alternating text/tags pairs
+        # and the widget line of each newly shown entry is noted for its repeat counter
+        perf = self.perf; t = time.perf_counter() if perf.enabled else None
+        args = []; first = int(self.txt_area.index("end-1c").split(".")[0])
+        for k, (text, tag, spans, entry) in enumerate(batch):
+            args += self.highlight_segments(text, tag, spans)
+            if entry is not None and entry.line is None: entry.line = self.view_base + first + k
+        if t is not None: t2 = time.perf_counter(); perf.add("highlight", t2 - t); t = t2
+        if args: self.txt_area.insert(tk.END, *args)
+        if t is not None: perf.add("insert", time.perf_counter() - t)
+
     def start_monitoring(self, path, save=True, retranslate=True):
         self.running = False
-        self.seen_lines.clear()
         self.log_file_path = path
         if retranslate: self.retranslate_ui(refresh_monitor=False)
+        self.store = LineStore(); self.shown_upto = 0; self.matched = None; self.view.deactivate()
         if save: self.save_session()
-        self.txt_area.config(state=tk.NORMAL); self.txt_area.delete('1.0', tk.END)
+        self.reset_view()
         self.show_loading(True); self.root.after(150, self._launch_thread) 
 
     def _launch_thread(self):
         self.running = True
-        self.monitor_thread = threading.Thread(target=self.monitor_loop, daemon=True); self.monitor_thread.start()
+        self.line_queue = LineQueue(QUEUE_MAX_LINES, QUEUE_POLICY); self.store = LineStore(); self.stats = LogStats(); self.sessions = SessionIndex(self.log_file_path)
+        if self.load_full_file.get():
+            self.view.activate(LineIndex(self.log_file_path)); target, args = self.index_loop, (self.line_queue, self.view.index, self.stats, self.sessions)
+        else: target, args = self.monitor_loop, (self.line_queue, self.store, self.stats, self.sessions)
+        self.monitor_thread = threading.Thread(target=target, args=args, daemon=True); self.monitor_thread.start()
 
     # --- UI SETUP ---
     def setup_ui(self):
@@ -242,6 +647,7 @@ class KodiLogMonitor:
         self.search_entry = tk.Entry(search_box, textvariable=self.search_query, bg=COLOR_BG_MAIN, fg="white", borderwidth=0, width=22, insertbackground="white", font=("Segoe UI", 9))
         self.search_entry.pack(side=tk.LEFT, padx=5, pady=4)
         self.btn_clear_search = tk.Button(search_box, text="×", bg=COLOR_BG_MAIN, fg="#888888", relief="flat", font=("Segoe UI", 11, "bold"), command=self.clear_search)
+        tk.Checkbutton(search_box, text=".*", variable=self.search_regex, indicatoron=0, bg=COLOR_BG_MAIN, fg="#888888", selectcolor=COLOR_ACCENT, relief="flat", font=("Consolas", 9, "bold"), padx=4, command=self.trigger_refresh).pack(side=tk.RIGHT)
 
         opt_box = tk.Frame(sh_left, bg=COLOR_BG_SUBHEADER); opt_box.pack(side=tk.LEFT)
         tk.Checkbutton(opt_box, text="∞", variable=self.load_full_file, indicatoron=0, bg=COLOR_BTN_DEFAULT, fg="white", selectcolor=COLOR_ACCENT, relief="flat", font=("Segoe UI", 10, "bold"), padx=10, pady=2, command=self.toggle_full_load).pack(side=tk.LEFT, padx=2)
@@ -267,6 +673,13 @@ class KodiLogMonitor:
         tk.Label(footer, textvariable=self.limit_var, anchor=tk.W, fg="#FF9800", bg=COLOR_BG_FOOTER, font=("Segoe UI", 8, "bold")).pack(side=tk.LEFT)
         tk.Label(footer, textvariable=self.paused_var, anchor=tk.W, fg=COLOR_DANGER, bg=COLOR_BG_FOOTER, font=("Segoe UI", 8, "bold"), padx=10).pack(side=tk.LEFT)
         tk.Label(footer, text=f"KODI LOG MONITOR {APP_VERSION}", anchor=tk.E, fg="#e0e0e0", bg=COLOR_BG_FOOTER, font=("Segoe UI", 8, "bold"), padx=10).pack(side=tk.RIGHT)
+        tk.Checkbutton(footer, text="⏺", variable=self.profiling, indicatoron=0, bg=COLOR_BG_FOOTER, fg="#e0e0e0", selectcolor=COLOR_DANGER, relief="flat", font=("Segoe UI", 8), padx=4, command=self.toggle_profiling).pack(side=tk.RIGHT)
+        tk.Checkbutton(footer, text="⏱", variable=self.perf_panel, indicatoron=0, bg=COLOR_BG_FOOTER, fg="#e0e0e0", selectcolor=COLOR_ACCENT, relief="flat", font=("Segoe UI", 8), padx=4, command=self.toggle_perf).pack(side=tk.RIGHT)
+        self.export_box = tk.Frame(footer, bg=COLOR_BG_FOOTER); self.export_var = tk.StringVar()
+        tk.Label(self.export_box, textvariable=self.export_var, fg="#e0e0e0", bg=COLOR_BG_FOOTER, font=("Segoe UI", 8, "bold")).pack(side=tk.LEFT)
+        self.export_bar = ttk.Progressbar(self.export_box, length=120, mode="determinate", maximum=100)
+        self.export_stop = tk.Button(self.export_box, text="✖", command=self.cancel_export, bg=COLOR_BG_FOOTER, fg="#e0e0e0", relief="flat", borderwidth=0, font=("Segoe UI", 8), cursor="hand2", activebackground=COLOR_DANGER)
+        self.perf_var = tk.StringVar(); self.perf_label = tk.Label(footer, textvariable=self.perf_var, anchor=tk.W, fg=LOG_COLORS["repeat"], bg=COLOR_BG_FOOTER, font=("Consolas", 8))
 
     def detect_os_language(self):
         try:
@@ -285,54 +698,38 @@ class KodiLogMonitor:
 
     def update_tags_config(self):
         c_font = ("Consolas", self.font_size)
-        for t in ["info", "warning", "error", "summary"]: self.txt_area.tag_config(t, foreground=LOG_COLORS[t], font=(c_font[0], self.font_size))
+        for t in ["info", "warning", "error", "summary", "repeat"]: self.txt_area.tag_config(t, foreground=LOG_COLORS[t], font=(c_font[0], self.font_size))
         self.txt_area.tag_config("highlight", background=LOG_COLORS["highlight_bg"], foreground=LOG_COLORS["highlight_fg"], font=(c_font[0], self.font_size))
-        self.txt_area.configure(bg=COLOR_BG_MAIN, font=c_font); self.font_label.config(text=str(self.font_size))
+        self.txt_area.configure(bg=COLOR_BG_MAIN, font=c_font); self.font_label.config(text=str(self.font_size)); self.view.render()
 
     def reset_all_filters(self):
         l = LANGS.get(self.current_lang.get(), LANGS["EN"])
-        self.current_filter_tag.set("all"); self.search_query.set(""); self.selected_list.set(l["none"]); self.is_paused.set(False); self.toggle_pause_scroll(); self.trigger_refresh()
-
-    def get_line_data(self, line):
-        low = line.lower(); tag_f = self.current_filter_tag.get(); q = self.search_query.get().lower()
-        if not (tag_f == "all" or f" {tag_f} " in low): return None
-        if q and q not in low: return None
+        self.current_filter_tag.set("all"); self.search_query.set(""); self.search_regex.set(False); self.selected_list.set(l["none"]); self.is_paused.set(False); self.toggle_pause_scroll(); self.trigger_refresh()
+
+    def highlight_segments(self, text, base_tag, spans=()):
+        # Tags must never be None here: tkinter truncates the argument list at the first None
+        base = base_tag or ""
+        if not spans: return [text, base]
+        hl = (base_tag, "highlight") if base_tag else "highlight"
+        segs = []; last_idx = 0
+        for start, end in spans:
+            segs += [text[last_idx:start], base, text[start:end], hl]
+            last_idx = end
+        segs += [text[last_idx:], base]
+        return segs
+
+    def load_keyword_matcher(self):
         l_ui = LANGS.get(self.current_lang.get(), LANGS["EN"])
-        if self.selected_list.get() != l_ui["none"]:
-            kw = self.get_keywords_from_file()
-            if kw and not any(k.lower() in low for k in kw): return None
-        tag = "error" if " error " in low else "warning" if " warning " in low else "info" if " info " in low else None
-        return (line, tag)
-
-    def insert_with_highlight(self, text, base_tag):
-        l_ui = LANGS.get(self.current_lang.get(), LANGS["EN"])
-        if self.selected_list.get() == l_ui["none"]: self.txt_area.insert(tk.END, text, base_tag); return
-        kw = self.get_keywords_from_file()
-        if not kw: self.txt_area.insert(tk.END, text, base_tag); return
-        matches = list(re.finditer("|".join(re.escape(k) for k in kw), text, re.IGNORECASE))
-        if not matches: self.txt_area.insert(tk.END, text, base_tag); return
-        last_idx = 0
-        for m in matches:
-            self.txt_area.insert(tk.END, text[last_idx:m.start()], base_tag)
-            self.txt_area.insert(tk.END, text[m.start():m.end()], (base_tag, "highlight"))
-            last_idx = m.end()
-        self.txt_area.insert(tk.END, text[last_idx:], base_tag)
-
-    def get_keywords_from_file(self):
-        l_ui = LANGS.get(self.current_lang.get(), LANGS["EN"])
-        if self.selected_list.get() == l_ui["none"]: return []
-        path = os.path.join(KEYWORD_DIR, f"{self.selected_list.get()}.txt")
-        try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f: return [line.strip() for line in f if line.strip()]
-        except: return []
+        if self.selected_list.get() == l_ui["none"]: return None
+        return get_keyword_matcher(os.path.join(KEYWORD_DIR, f"{self.selected_list.get()}.txt"))
 
     def update_stats(self):
         if not self.log_file_path: return
+        t = time.perf_counter() if self.perf.enabled else None
         l = LANGS.get(self.current_lang.get(), LANGS["EN"])
-        size_str, real_total = self.get_file_info()
+        size_str, real_total = self.get_file_info(); self.shown_size = self.stats.size
         self.limit_var.set(l["limit"] if not self.load_full_file.get() else "")
-        content = self.txt_area.get('1.0', 'end-1c')
-        display_count = len(content.splitlines()) if content.strip() else 0
+        display_count = self.get_display_count()
         tag = self.current_filter_tag.get()
         if tag == "all" and not self.search_query.get() and self.selected_list.get() == l["none"]:
             self.stats_var.set(l["stats_simple"].format(real_total, size_str))
@@ -342,22 +739,26 @@ class KodiLogMonitor:
             lst = f" + LIST: '{self.selected_list.get()}'" if self.selected_list.get() != l["none"] else ""
             self.stats_var.set(l["stats"].format(label, kw+lst, display_count, real_total, size_str))
         self.paused_var.set(f" | {l['paused']}" if self.is_paused.get() else "")
+        if t is not None: self.perf.add("stats", time.perf_counter() - t)
+
+    def get_display_count(self):
+        if self.view.active: return self.view.count()
+        # The Text widget keeps its line count in its B-tree, so this is O(1) unlike reading the content back
+        line, col = map(int, self.txt_area.index('end-1c').split('.'))
+        return line if col else line - 1
 
     def get_file_info(self):
-        if not self.log_file_path or not os.path.exists(self.log_file_path): return "0 KB", 0
-        try:
-            size_bytes = os.path.getsize(self.log_file_path); f_obj = open(self.log_file_path, 'rb')
-            line_count = sum(1 for _ in f_obj); f_obj.close()
-            temp_size = size_bytes
-            for unit in ['B', 'KB', 'MB', 'GB']:
-                if temp_size < 1024: return f"{temp_size:.2f} {unit}", line_count
-                temp_size /= 1024
-        except: pass
-        return "N/A", 0
+        if not self.log_file_path: return "0 KB", 0
+        temp_size = self.stats.size
+        for unit in ['B', 'KB', 'MB', 'GB']:
+            if temp_size < 1024: return f"{temp_size:.2f} {unit}", self.stats.total_lines
+            temp_size /= 1024
+        return f"{temp_size:.2f} TB", self.stats.total_lines
 
     def trigger_refresh(self, *args):
+        if self.search_job: self.root.after_cancel(self.search_job); self.search_job = None
         self.update_filter_button_colors()
-        if self.log_file_path: self.start_monitoring(self.log_file_path, save=False, retranslate=False)
+        if self.log_file_path: self.refilter()
 
     def on_list_selected(self, event): self.combo_lists.selection_clear(); self.root.focus_set(); self.trigger_refresh()
     def open_keyword_folder(self):
@@ -367,6 +768,7 @@ class KodiLogMonitor:
 
     def refresh_keyword_lists(self, trigger_monitor=True):
         l = LANGS.get(self.current_lang.get(), LANGS["EN"])
+        clear_keyword_cache()
         files = [f.replace(".txt", "") for f in os.listdir(KEYWORD_DIR) if f.endswith(".txt")]
         self.combo_lists['values'] = [l["none"]] + sorted(files)
         if self.selected_list.get() not in self.combo_lists['values']: self.selected_list.set(l["none"])
@@ -387,16 +789,24 @@ class KodiLogMonitor:
         self.refresh_keyword_lists(trigger_monitor=refresh_monitor)
         self.update_stats(); self.update_filter_button_colors()
 
-    def clear_console(self): self.txt_area.config(state=tk.NORMAL); self.txt_area.delete('1.0', tk.END); self.update_stats()
-    def apply_wrap_mode(self): self.txt_area.config(wrap=tk.WORD if self.wrap_mode.get() else tk.NONE)
+    def clear_console(self):
+        if self.view.active: self.view.clear()
+        else: self.reset_view()
+        self.update_stats()
+    def apply_wrap_mode(self): self.txt_area.config(wrap=tk.WORD if self.wrap_mode.get() else tk.NONE); self.view.render()
     def toggle_full_load(self): self.save_session(); self.start_monitoring(self.log_file_path, False, False)
     def toggle_pause_scroll(self): 
-        if not self.is_paused.get() and self.log_file_path: self.txt_area.see(tk.END)
+        if not self.is_paused.get() and self.log_file_path:
+            if self.view.active: self.view.render(follow=True)
+            else: self.txt_area.see(tk.END)
         self.update_stats()
     def on_search_change(self, *args):
         if self.search_query.get(): self.btn_clear_search.pack(side=tk.LEFT, padx=(0, 2))
         else: self.btn_clear_search.pack_forget()
-        self.trigger_refresh()
+        # Search-as-you-type: the filter is applied once typing pauses. A ∞ scan still running is only
+        # replaced (and stopped) by a valid new filter, so an incomplete pattern leaves the last results in place
+        if self.search_job: self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(SEARCH_DEBOUNCE_MS, self.trigger_refresh)
     def clear_search(self): self.search_query.set(""); self.search_entry.focus()
     def show_loading(self, state):
         if state: self.loading_label.config(text=LANGS.get(self.current_lang.get(), LANGS["EN"])["loading"]); self.overlay.grid(row=0, column=0, sticky="nsew"); self.root.update_idletasks()
@@ -409,16 +819,86 @@ class KodiLogMonitor:
     def decrease_font(self): 
         if self.font_size > 6: self.font_size -= 1; self.update_tags_config(); self.save_session()
     def show_summary(self):
-        if not self.log_file_path: return
-        try:
-            with open(self.log_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                c = f.read(); s = list(re.finditer(r"(-+\n.*?Starting Kodi.*?-+\n)", c, re.DOTALL))
-                if s: self.txt_area.insert(tk.END, LANGS.get(self.current_lang.get(), LANGS["EN"])["sys_sum"], "summary"); self.txt_area.insert(tk.END, s[-1].group(1), "summary"); self.txt_area.see(tk.END)
-        except: pass
+        # Sessions come from the SessionIndex built by the tail thread: the latest summary is shown
+        # at once, earlier sessions are offered in a menu and jump the view to their start
+        if not self.log_file_path or not self.sessions or not self.sessions.sessions: return
+        sessions = list(self.sessions.sessions)
+        if len(sessions) == 1: self.insert_summary(sessions[-1]); return
+        menu = tk.Menu(self.root, tearoff=0, bg=COLOR_BTN_DEFAULT, fg="white", activebackground=COLOR_ACCENT, activeforeground="white", font=("Segoe UI", 9))
+        menu.add_command(label=LANGS.get(self.current_lang.get(), LANGS["EN"])["sum"], command=lambda: self.insert_summary(sessions[-1]))
+        menu.add_separator()
+        for n in range(len(sessions), 0, -1): menu.add_command(label=f"#{n}  {sessions[n - 1].label()}", command=lambda s=sessions[n - 1]: self.jump_to_offset(s.offset))
+        menu.tk_popup(self.btn_sum.winfo_rootx(), self.btn_sum.winfo_rooty() + self.btn_sum.winfo_height())
+    def insert_summary(self, session):
+        try: text = self.sessions.text(session)
+        except OSError: return
+        if self.view.active: self.jump_to_offset(session.offset); return  # the view shows the file itself
+        self.txt_area.config(state=tk.NORMAL)
+        self.txt_area.insert(tk.END, LANGS.get(self.current_lang.get(), LANGS["EN"])["sys_sum"], "summary"); self.txt_area.insert(tk.END, text, "summary"); self.txt_area.see(tk.END)
+    def jump_to_offset(self, offset):
+        # Scrolls to the line at a byte offset (auto-scroll is paused so the tail does not pull the view back).
+        # Outside the 1000 loaded lines the whole file is needed: ∞ mode is switched on and the jump done after loading
+        if self.view.active:
+            self.is_paused.set(True); self.view.jump_to(self.view.index.line_at(offset)); self.update_stats(); return
+        k = self.store.find_offset(offset)
+        pos = self.txt_area.search(self.store.text(k).rstrip("\n"), "1.0", tk.END) if k is not None else ""
+        if pos: self.is_paused.set(True); self.txt_area.yview(pos); self.update_stats(); return
+        self.pending_jump = offset; self.load_full_file.set(True); self.toggle_full_load()
     def export_log(self):
-        p = filedialog.asksaveasfilename(defaultextension=".txt", initialfile="kodi_extract.txt")
-        if p:
-            with open(p, "w", encoding="utf-8") as f: f.write(self.txt_area.get("1.0", tk.END))
+        # Streams the current filters over the whole file from a thread, so the export is not limited to
+        # what the view holds and a big log never blocks the UI. A .jsonl name gives one JSON record per
+        # line (time, thread, level, component, add-on, message, matched keywords). With lines selected in the
+        # view, a menu offers to export only their time range (the whole log stays the first choice)
+        if not self.log_file_path or self.export_cancel: return
+        since, until = self.selected_time_range()
+        if since is None: self.start_export(); return
+        span = f"🕒 {format_time(since[0] % 86400)} – {format_time(until[0] % 86400)}"
+        menu = tk.Menu(self.root, tearoff=0, bg=COLOR_BTN_DEFAULT, fg="white", activebackground=COLOR_ACCENT, activeforeground="white", font=("Segoe UI", 9))
+        menu.add_command(label=LANGS.get(self.current_lang.get(), LANGS["EN"])["exp"], command=self.start_export)
+        menu.add_command(label=span, command=lambda: self.start_export(since, until, span))
+        menu.tk_popup(self.btn_exp.winfo_rootx(), self.btn_exp.winfo_rooty() + self.btn_exp.winfo_height())
+    def start_export(self, since=None, until=None, span=""):
+        # span: label of the time range, shown in the footer while and after exporting
+        if not self.log_file_path or self.export_cancel: return
+        try: flt = LogFilter(self.current_filter_tag.get(), self.search_query.get(), self.kw_matcher, since=since, until=until, regex=self.search_regex.get())
+        except re.error: return
+        p = filedialog.asksaveasfilename(defaultextension=".txt", initialfile="kodi_extract.txt", filetypes=[("Text", "*.txt"), ("JSON Lines", "*.jsonl")])
+        if not p: return
+        try: size = os.path.getsize(self.log_file_path)
+        except OSError: return
+        fmt = "jsonl" if p.lower().endswith((".jsonl", ".json")) else "text"
+        cancel = self.export_cancel = threading.Event(); self.export_span = f" · {span}" if span else ""
+        self.export_var.set(f"💾 0%{self.export_span}"); self.export_bar.config(value=0)
+        self.export_bar.pack(side=tk.LEFT, padx=(6, 0)); self.export_stop.pack(side=tk.LEFT, padx=(4, 0)); self.export_box.pack(side=tk.RIGHT, padx=10)
+        threading.Thread(target=self.export_worker, args=(self.log_file_path, p, fmt, flt, size, cancel), daemon=True).start()
+    def selected_time_range(self):
+        # (since, until) bounds from the first and last selected lines, or (None, None)
+        try: first, last = self.txt_area.get("sel.first linestart", "sel.first lineend"), self.txt_area.get("sel.last -1c linestart", "sel.last -1c lineend")
+        except tk.TclError: return None, None
+        times = [parse_line(text + "\n").time for text in (first, last)]
+        if None in times: return None, None  # a selection starting or ending on a traceback line exports everything
+        return (times[0], times[0] >= 86400), (times[1], times[1] >= 86400)
+    def export_worker(self, path, target, fmt, flt, size, cancel):
+        written, done = 0, False
+        progress = lambda off, n: self.post(self.export_progress, cancel, off * 100 / max(1, size), n)
+        try:
+            with open(target, "w", encoding="utf-8") as f: written, done = export_lines(iter_file_lines(path), flt, f, fmt, progress, cancel.is_set)
+        except OSError: pass
+        if not done:
+            try: os.remove(target)
+            except OSError: pass
+        if not self.closing: self.post(self.export_finished, cancel, written if done else None)
+    def export_progress(self, cancel, pct, written):
+        if cancel is not self.export_cancel or cancel.is_set(): return
+        self.export_bar.config(value=pct); self.export_var.set(f"💾 {pct:.0f}% · {written:,}{self.export_span}")
+    def export_finished(self, cancel, written):
+        if cancel is not self.export_cancel: return
+        self.export_cancel = None; self.export_bar.pack_forget(); self.export_stop.pack_forget()
+        if written is None: self.export_box.pack_forget(); return
+        self.export_var.set(f"💾 ✓ {written:,}{self.export_span}")
+        self.root.after(EXPORT_STATUS_MS, lambda: self.export_cancel or self.export_box.pack_forget())
+    def cancel_export(self):
+        if self.export_cancel: self.export_cancel.set()
     def save_session(self):
         try:
             with open(CONFIG_FILE, "w", encoding="utf-8") as f: f.write(f"{self.log_file_path}\n{self.current_lang.get()}\n{'1' if self.load_full_file.get() else '0'}\n{self.font_size}\n{self.window_geometry}\n{self.selected_list.get()}")
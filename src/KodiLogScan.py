@@ -0,0 +1,148 @@
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from KodiLogEngine import KeywordMatcher, resolve_keyword_list
+
+# --- BATCH SCANNER ---
+# Scans many Kodi logs against keyword lists: files are cut into newline-aligned chunks that
+# are scanned in a process pool (each worker compiles the lists once), and the per-chunk
+# results are merged into one report per file: hits per keyword and per list, first/last
+# matching line numbers and the Kodi version from the "Starting Kodi" banner.
+SCAN_CHUNK = 16 * 1024 * 1024
+KODI_VERSION_RE = re.compile(rb"starting kodi \((.*?)\)(?:\. platform:|\s*$)", re.MULTILINE)
+
+_WORKER_MATCHERS = {}
+
+def _init_worker(list_paths):
+    for path in list_paths: _WORKER_MATCHERS[path] = KeywordMatcher(path)
+
+def find_log_files(inputs, pattern="*.log"):
+    files = []
+    for item in inputs:
+        if os.path.isdir(item): found = sorted(glob.glob(os.path.join(item, pattern)))
+        elif os.path.isfile(item): found = [item]
+        else: found = sorted(p for p in glob.glob(item) if os.path.isfile(p))
+        files += [p for p in found if p not in files]
+    return files
+
+def chunk_ranges(path, chunk_size=SCAN_CHUNK):
+    size = os.path.getsize(path); ranges = []; start = 0
+    with open(path, "rb") as f:
+        while start < size:
+            end = min(size, start + chunk_size)
+            if end < size:
+                f.seek(end)
+                while True:  # move the cut to just after the next newline
+                    block = f.read(65536)
+                    if not block: end = size; break
+                    nl = block.find(b"\n")
+                    if nl >= 0: end += nl + 1; break
+                    end += len(block)
+            ranges.append((start, end)); start = end
+    return ranges
+
+def scan_chunk(path, start, end, list_paths):
+    # Line numbers in the result are relative to the chunk (0-based); merge_results makes them absolute
+    with open(path, "rb") as f: f.seek(start); data = f.read(end - start)
+    low = data.lower()
+    lists = {}
+    for list_path in list_paths:
+        matcher = _WORKER_MATCHERS.get(list_path) or _WORKER_MATCHERS.setdefault(list_path, KeywordMatcher(list_path))
+        if matcher.regex_bytes is None: continue
+        names = {k.lower(): k for k in matcher.keywords}
+        keywords = {}; hit_lines = []; line = 0; prev = 0
+        for m in matcher.regex_bytes.finditer(low):
+            line += low.count(b"\n", prev, m.start()); prev = m.start()
+            name = names.get(m.group().decode("utf-8", errors="ignore"), m.group().decode("utf-8", errors="ignore"))
+            entry = keywords.get(name)
+            if entry is None: keywords[name] = [1, line, line]
+            elif entry[2] != line: entry[0] += 1; entry[2] = line
+            if not hit_lines or hit_lines[-1] != line: hit_lines.append(line)
+        if hit_lines: lists[list_path] = {"lines": len(hit_lines), "first": hit_lines[0], "last": hit_lines[-1], "keywords": keywords}
+    versions = [(low.count(b"\n", 0, m.start()), data[m.start(1):m.end(1)].decode("utf-8", errors="ignore").strip()) for m in KODI_VERSION_RE.finditer(low)]
+    return {"newlines": data.count(b"\n"), "lists": lists, "versions": versions}
+
+def merge_results(path, chunks, list_names):
+    # chunks: scan_chunk results in file order
+    report = {"file": path, "size": os.path.getsize(path), "lines": 0, "kodi_version": None, "lists": {}}
+    base = 0
+    for res in chunks:
+        for line, version in res["versions"]: report["kodi_version"] = version
+        for list_path, hit in res["lists"].items():
+            entry = report["lists"].setdefault(list_names[list_path], {"lines": 0, "first_line": None, "last_line": None, "keywords": {}})
+            entry["lines"] += hit["lines"]
+            if entry["first_line"] is None: entry["first_line"] = base + hit["first"] + 1
+            entry["last_line"] = base + hit["last"] + 1
+            for name, (count, first, last) in hit["keywords"].items():
+                kw = entry["keywords"].setdefault(name, {"hits": 0, "first_line": base + first + 1, "last_line": None})
+                kw["hits"] += count; kw["last_line"] = base + last + 1
+        base += res["newlines"]
+    report["lines"] = base + (1 if report["size"] and not _ends_with_newline(path) else 0)
+    for entry in report["lists"].values(): entry["keywords"] = dict(sorted(entry["keywords"].items(), key=lambda kv: (-kv[1]["hits"], kv[0].lower())))
+    return report
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f: f.seek(-1, os.SEEK_END); return f.read(1) == b"\n"
+
+def scan_logs(files, list_paths, workers=None, chunk_size=SCAN_CHUNK):
+    list_names = {p: os.path.splitext(os.path.basename(p))[0] for p in list_paths}
+    jobs = [(path, start, end) for path in files for start, end in chunk_ranges(path, chunk_size)]
+    if workers == 1: 
+        _init_worker(list_paths); results = [scan_chunk(path, start, end, list_paths) for path, start, end in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(list_paths,)) as pool:
+            results = list(pool.map(scan_chunk, *zip(*jobs), [list_paths] * len(jobs))) if jobs else []
+    by_file = {path: [] for path in files}
+    for (path, start, end), res in zip(jobs, results): by_file[path].append(res)
+    return [merge_results(path, by_file[path], list_names) for path in files]
+
+def format_report(reports):
+    out = []
+    for r in reports:
+        out.append(f"{r['file']}  ({'Kodi ' + r['kodi_version'] if r['kodi_version'] else 'Kodi version unknown'}, {r['lines']:,} lines)")
+        if not r["lists"]: out.append("  no hits")
+        for name, entry in r["lists"].items():
+            out.append(f"  {name}: {entry['lines']:,} lines (first {entry['first_line']:,}, last {entry['last_line']:,})")
+            for kw, hit in entry["keywords"].items(): out.append(f"    {kw:<32} {hit['hits']:>7,}  ({hit['first_line']:,} - {hit['last_line']:,})")
+    return "\n".join(out)
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="KodiLogScan", description="Scan many Kodi logs against keyword lists in parallel.")
+    p.add_argument("inputs", nargs="+", help="log files, directories or glob patterns")
+    p.add_argument("-k", "--list", action="append", help="keyword list name or path (repeatable, default: every list in --keyword-dir)")
+    p.add_argument("--keyword-dir", default="keyword_lists")
+    p.add_argument("--pattern", default="*.log", help="file pattern used inside directories (default: *.log)")
+    p.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="worker processes (default: CPU count)")
+    p.add_argument("--chunk-mb", type=int, default=SCAN_CHUNK // 1048576, help="size of the pieces large logs are split into")
+    p.add_argument("-o", "--output", help="write the report to this file (JSON if it ends with .json)")
+    p.add_argument("-j", "--json", action="store_true", help="print the report as JSON")
+    args = p.parse_args(argv)
+    try:
+        if args.list: list_paths = [resolve_keyword_list(name, args.keyword_dir) for name in args.list]
+        else: list_paths = sorted(glob.glob(os.path.join(args.keyword_dir, "*.txt")))
+        if not list_paths: raise FileNotFoundError(f"No keyword lists found in {args.keyword_dir}")
+        files = find_log_files(args.inputs, args.pattern)
+        if not files: raise FileNotFoundError("No log files found")
+        t = time.perf_counter()
+        reports = scan_logs(files, list_paths, max(1, args.workers), max(1, args.chunk_mb) * 1048576)
+        elapsed = time.perf_counter() - t
+    except OSError as e:
+        print(f"KodiLogScan: {e}", file=sys.stderr); return 1
+    as_json = args.json or (args.output or "").lower().endswith(".json")
+    text = json.dumps(reports, indent=2, ensure_ascii=False) if as_json else format_report(reports)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f: f.write(text + "\n")
+    else: print(text)
+    print(f"Scanned {len(files)} file(s), {sum(r['size'] for r in reports) / 1048576:,.1f} MB in {elapsed:.1f}s", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
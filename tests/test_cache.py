@@ -0,0 +1,49 @@
+import os
+
+from KodiLogEngine import IndexCache, LineIndex, LogFilter, SessionIndex
+
+LINES = "".join(f"2024-05-01 08:00:{i // 1000 % 60:02d}.{i % 1000:03d} T:{i % 7} {'error' if i % 5 == 0 else ' info'} <general>: line {i}\n" for i in range(3000))
+
+def indexed(path, cache=None):
+    idx = LineIndex(str(path)); sessions = SessionIndex(str(path))
+    loaded = cache.load(idx, sessions) if cache else False
+    idx.update(); sessions.update()
+    return idx, sessions, loaded
+
+def test_cache_is_reused_and_extended(tmp_path):
+    path = tmp_path / "kodi.log"; path.write_text(LINES, encoding="utf-8")
+    cache = IndexCache(str(tmp_path / "cache"))
+    idx, sessions, loaded = indexed(path, cache)
+    idx.select(LogFilter("error"))  # parses levels, which are cached too
+    assert not loaded and cache.save(idx, sessions)
+    with open(path, "a", encoding="utf-8") as f: f.write("2024-05-01 09:00:00.000 T:1   error <general>: appended\n")
+    cached, _, loaded = indexed(path, cache)
+    fresh, _, _ = indexed(path)
+    assert loaded and list(cached.starts) == list(fresh.starts) and cached.count == 3001
+    assert list(cached.select(LogFilter("error"))) == list(fresh.select(LogFilter("error")))
+
+def test_cache_is_rejected_when_the_log_changed(tmp_path):
+    path = tmp_path / "kodi.log"; path.write_text(LINES, encoding="utf-8")
+    cache = IndexCache(str(tmp_path / "cache"))
+    idx, sessions, _ = indexed(path); cache.save(idx, sessions)
+    path.write_text(LINES.replace("line 1\n", "LINE 1\n"), encoding="utf-8")  # same size, other content
+    assert not cache.load(LineIndex(str(path)))
+    cache.save(*indexed(path)[:2]); path.write_text(LINES[:1000], encoding="utf-8")  # truncated
+    assert not cache.load(LineIndex(str(path)))
+    cache.save(*indexed(path)[:2])
+    other = tmp_path / "new.log"; other.write_text(LINES[:1000], encoding="utf-8"); os.replace(other, path)  # replaced by Kodi
+    assert not cache.load(LineIndex(str(path)))
+    idx, sessions, _ = indexed(path); cache.save(idx, sessions)
+    assert cache.load(LineIndex(str(path)))
+    with open(cache.entry(str(path)), "r+b") as c: c.write(b"junk")
+    assert not cache.load(LineIndex(str(path)))
+
+def test_least_recently_used_caches_are_pruned(tmp_path):
+    cache = IndexCache(str(tmp_path / "cache")); paths = []
+    for n in range(3):
+        path = tmp_path / f"kodi{n}.log"; path.write_text(LINES, encoding="utf-8"); paths.append(path)
+        idx, sessions, _ = indexed(path); cache.save(idx, sessions)
+    size = os.path.getsize(cache.entry(str(paths[0])))
+    os.utime(cache.entry(str(paths[0])), (1, 1)); os.utime(cache.entry(str(paths[1])), (2, 2))
+    cache.max_bytes = 2 * size; cache.prune()
+    assert [os.path.exists(cache.entry(str(p))) for p in paths] == [False, True, True]
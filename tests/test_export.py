@@ -0,0 +1,39 @@
+import io, json
+
+import KodiLogEngine
+from KodiLogEngine import LogFilter, export_lines
+
+LINES = [
+    "2024-05-01 08:00:00.000 T:1318    info <general>: Starting playback\n",
+    "2024-05-01 08:00:01.000 T:1402   error <general>: EXCEPTION Thrown (PythonToCppException)\n",
+    "                                                   KeyError: 'playlist'\n",
+    "2024-05-01 08:00:02.000 T:1318   debug <general>: CurlFile::Open - playlist.m3u\n",
+    "2024-05-01 08:00:03.000 T:1318   error <general>: Playlist failed\n",
+]
+
+def offsets(lines):
+    offset = 0
+    for line in lines: yield offset, line; offset += len(line.encode("utf-8"))
+
+def test_text_export_keeps_filtered_lines_and_continuations():
+    out = io.StringIO()
+    assert export_lines(offsets(LINES), LogFilter("error"), out) == (3, True)
+    assert out.getvalue() == "".join(LINES[1:3] + LINES[4:])
+
+def test_jsonl_export_records():
+    out = io.StringIO()
+    assert export_lines(offsets(LINES), LogFilter(query="playlist"), out, "jsonl") == (3, True)
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [(r["line"], r["level"], r["continuation"]) for r in rows] == [(3, "error", True), (4, "debug", False), (5, "error", False)]
+    assert rows[0]["time"] == "2024-05-01 08:00:01.000" and rows[0]["message"] == LINES[2].rstrip("\n")
+
+def test_time_range_export():
+    out = io.StringIO()
+    assert export_lines(offsets(LINES), LogFilter(since="08:00:01", until="08:00:02"), out) == (3, True)
+    assert out.getvalue() == "".join(LINES[1:4])
+
+def test_cancelled_export_reports_progress(monkeypatch):
+    monkeypatch.setattr(KodiLogEngine, "EXPORT_CHUNK_LINES", 2)
+    out = io.StringIO(); progress = []
+    assert export_lines(offsets(LINES), LogFilter(), out, progress=lambda off, n: progress.append((off, n)), cancel=lambda: True) == (2, False)
+    assert progress == [(len("".join(LINES[:2])), 2)]
@@ -0,0 +1,35 @@
+import pytest
+
+import KodiLogEngine
+from KodiLogEngine import LineIndex, LogFilter
+
+LINES = [
+    "2024-05-01 08:08:09.617 T:1402    info <general>: Creating InputStream",
+    "2024-05-01 08:08:09.640 T:1724   debug <general>: CurlFile::Open - https://api.example.com/list.json",
+    "",
+    "2024-05-01 08:08:09.655 T:1688   error <general>: CVideoPlayer::OpenFile: /storage/videos/Amélie (2001).mkv",
+    "2024-05-01 08:08:09.679 T:1318 warning <general>: [plugin.video.x] Reading settings",
+]
+
+def make_index(tmp_path, lines=LINES):
+    path = tmp_path / "kodi.log"
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+    idx = LineIndex(str(path)); idx.update()
+    return idx
+
+@pytest.mark.parametrize("query", [".*", "$", "^", "^$", "err|", "(?=e)"])
+def test_empty_match_regex_hits_each_line_once(tmp_path, query):
+    idx = make_index(tmp_path)
+    rx, rx_bytes = KodiLogEngine.search_pattern(query)
+    assert list(idx.hit_lines(rx_bytes, text_rx=rx)) == [i for i, line in enumerate(LINES) if rx.search(line)]
+
+@pytest.mark.parametrize("chunk", [1, 64, 4096])
+def test_empty_match_regex_select_across_chunks(tmp_path, monkeypatch, chunk):
+    monkeypatch.setattr(KodiLogEngine, "INDEX_CHUNK", chunk)
+    idx = make_index(tmp_path, LINES * 20)
+    assert list(idx.select(LogFilter(query=".*", regex=True))) == list(range(len(LINES) * 20))
+    assert list(idx.select(LogFilter(query="$", regex=True), 7, 30)) == list(range(7, 30))
+
+def test_hit_lines_stops_when_cancelled(tmp_path):
+    idx = make_index(tmp_path)
+    assert list(idx.hit_lines(KodiLogEngine.search_pattern(".*")[1], cancel=lambda: True)) == []
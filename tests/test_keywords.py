@@ -0,0 +1,19 @@
+import os
+
+from KodiLogEngine import clear_keyword_cache, get_keyword_matcher
+
+def test_matcher_spans_prefer_longest_keyword(tmp_path):
+    path = tmp_path / "list.txt"; path.write_text("Error\nerror code\n\nÉCHEC\n", encoding="utf-8")
+    m = get_keyword_matcher(str(path))
+    text = "An ERROR CODE 5, then échec and error"
+    assert [text[a:b] for a, b in m.spans(text)] == ["ERROR CODE", "échec", "error"]
+    assert m.spans("nothing here") == []
+    clear_keyword_cache()
+
+def test_matcher_is_cached_and_reloaded_when_the_list_changes(tmp_path):
+    path = tmp_path / "list.txt"; path.write_text("alpha\n", encoding="utf-8")
+    m = get_keyword_matcher(str(path))
+    assert get_keyword_matcher(str(path)) is m and m.spans("beta") == []
+    path.write_text("beta\n", encoding="utf-8"); st = os.stat(path); os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert get_keyword_matcher(str(path)) is m and m.spans("alpha beta") == [(6, 10)]
+    clear_keyword_cache()
@@ -0,0 +1,36 @@
+import pytest
+
+from KodiLogEngine import LEVEL_DEBUG, LEVEL_ERROR, LEVEL_FATAL, LEVEL_INFO, LEVEL_NONE, LineIndex, LineStore, LogFilter, parse_line, parse_lines
+
+HEADER = "2024-05-01 08:08:09.679 T:1318   debug <general>: [plugin.video.x] Reading settings, error count 0\n"
+
+def test_header_fields():
+    rec = parse_line(HEADER, 42)
+    assert (rec.offset, rec.thread, rec.level, rec.component, rec.addon, rec.parent) == (42, 1318, LEVEL_DEBUG, "general", "plugin.video.x", None)
+    assert rec.message == "[plugin.video.x] Reading settings, error count 0"
+    assert rec.time % 86400 == pytest.approx(8 * 3600 + 8 * 60 + 9.679)
+
+@pytest.mark.parametrize("line, level, addon", [
+    ("08:08:09.679 T:1318    info <general>: [script.module.foo] fatal error in message\n", LEVEL_INFO, "script.module.foo"),
+    ("2024-05-01 08:08:09.679 T:1318   FATAL <general>: CApplication::Create\n", LEVEL_FATAL, ""),
+    ("2024-05-01 08:08:09.679 T:1318   error: [not an add-on] no component\n", LEVEL_ERROR, ""),
+    ("2024-05-01 08:08:09.679 T:1318   error <general>: text [plugin.video.x] later\n", LEVEL_ERROR, ""),
+])
+def test_level_and_addon_come_from_the_line_format(line, level, addon):
+    rec = parse_line(line)
+    assert (rec.level, rec.addon) == (level, addon)
+
+def test_continuations_attach_to_their_header():
+    recs = list(parse_lines(enumerate([HEADER, "Traceback (most recent call last):\n", "KeyError: 'x'\n"])))
+    assert [r.parent for r in recs] == [None, recs[0], recs[0]]
+    assert {(r.thread, r.level, r.addon, r.time) for r in recs} == {(1318, LEVEL_DEBUG, "plugin.video.x", recs[0].time)}
+    assert parse_line("orphan line\n").level == LEVEL_NONE
+
+@pytest.mark.parametrize("since, until, expected", [("08:00", "08:00:02", [1, 2, 3]), ("08:00:01", None, [2, 3, 4]), ("2024-05-02 00:00", None, [])])
+def test_time_only_bounds_bind_on_the_first_timestamped_line(tmp_path, since, until, expected):
+    lines = ["Traceback (most recent call last):\n"] + [f"2024-05-01 08:00:0{i}.000 T:1    info <general>: line {i}\n" for i in range(4)]
+    path = tmp_path / "kodi.log"; path.write_text("".join(lines), encoding="utf-8")
+    idx = LineIndex(str(path)); idx.update(); store = LineStore()
+    for off, line in enumerate(lines): store.append(line, off)
+    assert list(idx.select(LogFilter(since=since, until=until))) == expected
+    assert [i for i, spans in store.select(LogFilter(since=since, until=until))] == expected
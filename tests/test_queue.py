@@ -0,0 +1,13 @@
+import pytest
+
+from KodiLogEngine import LineQueue
+
+@pytest.mark.parametrize("policy, items, skipped", [("drop_oldest", [2, 3], 2), ("summarize", [0, 1], 2)])
+def test_queue_policies(policy, items, skipped):
+    q = LineQueue(2, policy)
+    assert all(q.put(i) for i in range(4))
+    assert q.drain() == (items, skipped) and q.drain() == ([], 0)
+
+def test_blocking_queue_times_out():
+    q = LineQueue(1, "block")
+    assert q.put(0) and not q.put(1, timeout=0.01) and q.drain(1) == ([0], 0) and q.put(1)
@@ -0,0 +1,43 @@
+from KodiLogEngine import KeywordMatcher, LineStore, LogFilter, RepeatFilter
+
+LINES = [
+    "2024-05-01 08:08:09.000 T:1318   error <general>: [plugin.video.x] Failed to get playlist\n",
+    "2024-05-01 08:08:09.500 T:1318   error <general>: [plugin.video.x] Failed to get playlist\n",
+    "2024-05-01 08:08:10.000 T:1402   error <general>: EXCEPTION Thrown (PythonToCppException) : -->Python callback/script returned the following error<--\n",
+    "                                                   Traceback (most recent call last):\n",
+    "                                                   KeyError: 'playlist'\n",
+    "2024-05-01 08:08:10.100 T:1402   error <general>: -->End of Python script error report<--\n",
+]
+
+def shown_lines(store, flt):
+    repeats = RepeatFilter()
+    shown = [(i, entry) for i, spans in store.select(flt) for entry, ok in [repeats.add(store.text(i), store.head(i))] if ok]
+    return [(i, entry.count) for i, entry in shown]
+
+def make_store(lines=LINES):
+    store = LineStore(); offset = 0
+    for line in lines: store.append(line, offset); offset += len(line.encode("utf-8"))
+    return store
+
+def test_repeats_are_collapsed_with_their_traceback():
+    store = make_store(LINES[:2] + LINES[2:5] * 2)
+    repeats = RepeatFilter(); shown = []
+    for i in range(len(store)):
+        entry, ok = repeats.add(store.text(i), store.head(i))
+        if ok: shown.append(i)
+    assert shown == [0, 2, 3, 4]
+    assert [e.count for e in repeats.entries.values()] == [2, 2]
+
+def test_continuation_of_filtered_header_is_shown():
+    store = make_store()
+    assert shown_lines(store, LogFilter(level="error", query="playlist")) == [(0, 2), (4, 1)]
+
+def test_continuation_of_filtered_header_with_keywords(tmp_path):
+    kw = tmp_path / "keywords.txt"; kw.write_text("playlist\ntraceback\n", encoding="utf-8")
+    store = make_store()
+    assert [i for i, count in shown_lines(store, LogFilter(matcher=KeywordMatcher(str(kw))))] == [0, 3, 4]
+
+def test_continuation_without_head_keeps_previous_behaviour():
+    repeats = RepeatFilter()
+    entry, shown = repeats.add(LINES[0])
+    assert repeats.add(LINES[4]) == (entry, True)
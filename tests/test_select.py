@@ -0,0 +1,55 @@
+import pytest
+
+import KodiLogEngine
+from KodiLogEngine import KeywordMatcher, LineIndex, LineStore, LogFilter, iter_file_lines
+
+LOG = """\
+Kodi starting up
+2024-05-01 08:08:09.617 T:1402    info <general>: Creating InputStream
+2024-05-01 08:08:09.640 T:1724   debug <general>: CurlFile::Open - https://api.example.com/list.json
+2024-05-01 08:08:09.655 T:1688   ERROR <general>: CVideoPlayer::OpenFile: /storage/videos/AMÉLIE (2001).mkv
+2024-05-01 08:08:10.001 T:1688   error <general>: EXCEPTION Thrown (PythonToCppException) : -->Python callback/script returned the following error<--
+                                                   Traceback (most recent call last):
+                                                   KeyError: 'Amélie'
+2024-05-01 08:08:11.679 T:1318 warning <general>: [plugin.video.x] Reading settings for Amélie
+2024-05-01 08:08:12.000 T:1318   fatal <general>: Straße not found \xff
+2024-05-01 08:08:13.500 T:1402  notice <CSettingsManager>: Open settings
+"""
+
+FILTERS = [
+    dict(query="curlfile"), dict(query="amélie"), dict(query="straße"), dict(query="open"),
+    dict(query=r"open\w+", regex=True), dict(query="amél.e", regex=True), dict(query="É", regex=True), dict(query=r"^\s+keyerror|é", regex=True), dict(query="$", regex=True),
+    dict(level="error"), dict(level="info", query="open"), dict(thread=1688), dict(thread=1688, level="error"),
+    dict(since="08:08:09.650"), dict(until="08:08:11"), dict(since="2024-05-01 08:08:10", until="08:08:12", query="e"),
+    dict(keywords=["curlfile", "AMÉLIE"]), dict(keywords=["settings"], level="warning"),
+]
+
+@pytest.fixture
+def sources(tmp_path):
+    path = tmp_path / "kodi.log"
+    path.write_bytes(LOG.encode("utf-8").replace(b"\\xff", b"\xff"))
+    idx = LineIndex(str(path)); idx.update()
+    store = LineStore()
+    for off, line in iter_file_lines(str(path)): store.append(line, off)
+    return tmp_path, idx, store
+
+def make_filter(tmp_path, spec):
+    spec = dict(spec); words = spec.pop("keywords", None)
+    if words:
+        kw = tmp_path / "keywords.txt"; kw.write_text("\n".join(words), encoding="utf-8")
+        spec["matcher"] = KeywordMatcher(str(kw))
+    return LogFilter(**spec)
+
+@pytest.mark.parametrize("spec", FILTERS, ids=repr)
+@pytest.mark.parametrize("chunk", [64, 4096])
+def test_index_select_matches_store_select(sources, monkeypatch, spec, chunk):
+    monkeypatch.setattr(KodiLogEngine, "INDEX_CHUNK", chunk)
+    tmp_path, idx, store = sources
+    expected = [i for i, spans in store.select(make_filter(tmp_path, spec))]
+    assert expected and list(idx.select(make_filter(tmp_path, spec))) == expected
+
+def test_narrowed_select_matches_full_select(sources):
+    tmp_path, idx, store = sources
+    within = idx.select(LogFilter(query="am"))
+    assert list(idx.select(LogFilter(query="amélie"), within=within)) == list(idx.select(LogFilter(query="amélie")))
+    assert [i for i, spans in store.select(LogFilter(query="amélie"), within=list(within))] == list(idx.select(LogFilter(query="amélie")))
@@ -0,0 +1,29 @@
+from KodiLogEngine import SessionIndex
+
+def banner(day, version):
+    head = f"2024-05-{day:02d} 08:00:00.000 T:100    info <general>: "
+    return "".join(head + line + "\n" for line in [
+        "-" * 70, f"Starting Kodi ({version} (21.0.0) Git:20240406-0e4f8c4d9f). Platform: Linux x86 64-bit",
+        "Running on Ubuntu 22.04.4 LTS, kernel: Linux x86 64-bit version 6.5.0", "special://profile/ is mapped to: /home/kodi/.kodi/userdata",
+        "-" * 70, "initialize done", "Python interpreter version 3.11.4",
+    ])
+
+def test_sessions_are_indexed_incrementally(tmp_path):
+    path = tmp_path / "kodi.log"; path.write_text(banner(1, "21.0"), encoding="utf-8")
+    sessions = SessionIndex(str(path))
+    assert sessions.update() and len(sessions) == 1
+    s = sessions.sessions[0]
+    assert (s.offset, s.version, s.platform, s.python, s.profile) == (0, "21.0 (21.0.0) Git:20240406-0e4f8c4d9f", "Linux x86 64-bit", "3.11.4", "/home/kodi/.kodi/userdata")
+    assert s.system.startswith("Ubuntu 22.04.4 LTS")
+    assert not sessions.update()
+    size = path.stat().st_size
+    with open(path, "a", encoding="utf-8") as f: f.write(banner(2, "21.1"))
+    assert sessions.update() and [s.offset for s in sessions.sessions] == [0, size]
+    assert sessions.sessions[1].version.startswith("21.1") and "Starting Kodi (21.1" in sessions.text(sessions.sessions[1])
+
+def test_truncated_log_starts_over(tmp_path):
+    path = tmp_path / "kodi.log"; path.write_text(banner(1, "21.0") * 2, encoding="utf-8")
+    sessions = SessionIndex(str(path)); sessions.update()
+    path.write_text(banner(3, "21.2"), encoding="utf-8")
+    sessions.update()
+    assert [s.version[:4] for s in sessions.sessions] == ["21.2"]
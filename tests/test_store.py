@@ -0,0 +1,13 @@
+from itertools import takewhile
+
+from KodiLogEngine import LineStore, LogFilter, filter_lines, iter_file_lines
+
+def test_trimmed_lines_are_read_back_by_offset(tmp_path):
+    lines = [f"2024-05-01 10:00:{i // 10:02d}.{i:03d} T:1 {'error' if i % 3 else ' info'} <general>: line {i}\n" for i in range(100)]
+    path = tmp_path / "kodi.log"; path.write_text("".join(lines), encoding="utf-8")
+    store = LineStore()
+    for off, line in iter_file_lines(str(path), start=len("".join(lines[:10]))): store.append(line, off)
+    assert store.trim(30) == 60 and store.base == 60 and len(store) == 90
+    evicted = takewhile(lambda line: line[0] < store.offset(store.base), iter_file_lines(str(path), start=store.first_offset))
+    assert [rec.text for n, rec, spans in filter_lines(evicted, LogFilter("error"))] == [l for l in lines[10:70] if " error " in l]
+    assert [store.text(i) for i, spans in store.select(LogFilter("error"))] == [l for l in lines[70:] if " error " in l]
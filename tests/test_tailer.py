@@ -0,0 +1,25 @@
+import os
+
+from KodiLogEngine import LogTailer
+
+def test_tailer_reads_complete_lines_and_detects_rotation(tmp_path):
+    path = tmp_path / "kodi.log"; path.write_bytes(b"one\r\ntwo\nthr")
+    tailer = LogTailer(str(path), 0, "polling")
+    try:
+        assert tailer.read_lines() == [(0, "one\n"), (5, "two\n")] and tailer.changed() is None
+        with open(path, "ab") as f: f.write(b"ee\n")
+        assert tailer.read_lines() == [(9, "three\n")]
+        os.replace(path, tmp_path / "kodi.old.log")
+        assert tailer.changed() == "missing"
+        path.write_bytes(b"fresh\n")
+        assert tailer.changed() == "replaced"
+    finally: tailer.close()
+
+def test_tailer_detects_truncation(tmp_path):
+    path = tmp_path / "kodi.log"; path.write_bytes(b"a long first line\n")
+    tailer = LogTailer(str(path), 0, "polling")
+    try:
+        tailer.read_lines()
+        with open(path, "r+b") as f: f.truncate(0)
+        assert tailer.changed() == "replaced"
+    finally: tailer.close()